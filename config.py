@@ -1,6 +1,17 @@
 from simulation import *
 
 AGENT_TYPE = "Hybrid" # Random
+SOLVER_BACKEND = "cdcl" # dpll, dpll:vsids, dpll:first, reference, portfolio, numpy (needs NumPy)
+INFERENCE_WORKERS = 0 # Worker processes for large frontiers, 0 = serial
+PARALLEL_FRONTIER_THRESHOLD = 24 # Smaller frontiers are always solved serially
+SOLVER_STATS = False # Count decisions, propagations, ... and time of every query (InferenceEngine.stats)
+STEP_TIME_BUDGET = None # Seconds of solver search per agent step, None = unbounded (unproven cells stay uncertain)
+STEP_DECISION_BUDGET = None # Solver decisions per agent step, None = unbounded
+WUMPUS_COUNT_KNOWN = True # The agent knows how many wumpuses there are (at most that many cells hold one)
+PROBABILITY_MODE = "exact" # Pit risk of the advanced agent: "exact" model counting, "sampling" Gibbs sampler (needs NumPy, for huge maps)
+SAMPLER_SAMPLES = 20000 # Samples drawn at most per risk update in sampling mode
+SAMPLER_TOLERANCE = 0.01 # Stop sampling once every probability is within this standard error, None = always draw all samples
+SAMPLER_SEED = None # Fixed seed for reproducible runs, None = a new one every time
 
 MAP_SIZE = 8
 PIT_PROBABILITY = 0.2
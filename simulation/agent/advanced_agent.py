@@ -18,6 +18,10 @@ class AdvancedAgent(HybridAgent):
         self.percepts_at: dict[Point, set[Percept]] = {}
         self.RISK_WEIGHT = 10
 
+        # P(pit) of frontier cells (exact or sampled, see PROBABILITY_MODE), refreshed every decision in dynamic mode
+        self.pit_probabilities: dict[Point, float] = {}
+        self.PIT_RISK = 300 # Risk of a certain pit
+
         self.dynamic_mode_activated = False
         self.highly_suspicious_cells: set[Point] = set() 
         
@@ -90,14 +94,7 @@ class AdvancedAgent(HybridAgent):
         if cell in self.visited_cells or cell in self.safe_cells:
             pit_score = 0
         else:
-            pit_score = 0
-            safety_score_pit = 0
-            for neighbor_pos, _ in self.get_neighbors(cell):
-                if neighbor_pos in self.visited_cells:
-                    neighbor_percepts = self.percepts_at.get(neighbor_pos, set())
-                    if Percept.BREEZE in neighbor_percepts: pit_score += 150
-                    else: safety_score_pit += 75
-            pit_score = max(0, pit_score - safety_score_pit)
+            pit_score = self.pit_probabilities.get(cell, PIT_PROBABILITY) * self.PIT_RISK
 
         wumpus_score = 0
         safety_score_wumpus = 0
@@ -115,6 +112,19 @@ class AdvancedAgent(HybridAgent):
         total_risk = (pit_score * 1.2 + wumpus_score + wumpus_memory_risk) - escape_bonus
         return max(0, total_risk)
     
+    def update_pit_probabilities(self, kb: KB, inference: InferenceEngine):
+        """Computes P(pit | KB) for every frontier cell by weighted model counting, or estimates them all at once by Gibbs sampling."""
+        if PROBABILITY_MODE == "sampling":
+            symbols = {cell: f"P{cell.x}{cell.y}" for cell in self.get_frontier_cells()}
+            probabilities = inference.sample_probabilities(kb.pit_rules, list(symbols.values()), PIT_PROBABILITY,
+                                                           SAMPLER_SAMPLES, SAMPLER_TOLERANCE, seed=SAMPLER_SEED)
+            self.pit_probabilities = {cell: probabilities[symbol] for cell, symbol in symbols.items()}
+            return
+        self.pit_probabilities = {
+            cell: inference.probability(kb.pit_rules, f"P{cell.x}{cell.y}", PIT_PROBABILITY)
+            for cell in self.get_frontier_cells()
+        }
+
     def find_least_risky_frontier_cell(self) -> Point:
         """Tìm ô biên chưa thăm có rủi ro heuristic thấp nhất."""
         uncertain_cells = self.get_uncertain_cells()
@@ -200,6 +210,7 @@ class AdvancedAgent(HybridAgent):
             return
 
         print("--- Operating in Dynamic Mode (using heuristic risk assessment) ---")
+        self.update_pit_probabilities(kb, inference)
         
         # Chiến lược rút lui khi Wumpus sắp di chuyển
         if self.action_count > 0 and (self.action_count + 1) % WUMPUS_MOVE_INTERVAL == 0:
@@ -75,10 +75,11 @@ class HybridAgent(Agent):
         if not self.has_arrow:
             return False
 
-        frontier_cells = self.get_frontier_cells()
+        frontier_cells = list(self.get_frontier_cells())
+        wumpus_entailed = inference.entailed_literals(kb.wumpus_rules, [f"W{cell.x}{cell.y}" for cell in frontier_cells])
 
         for cell in frontier_cells:
-            if inference.ask_Wumpus(kb.wumpus_rules, Literal(f"W{cell.x}{cell.y}", negated=False)):
+            if Literal(f"W{cell.x}{cell.y}") in wumpus_entailed:
 
                 shooting_direction = self.get_direction_to_target(cell)
 
@@ -127,10 +128,11 @@ class HybridAgent(Agent):
             return False
         
         uncertain_cells = self.get_uncertain_cells()
+        wumpus_entailed = inference.backbone(kb.wumpus_rules, [f"W{cell.x}{cell.y}" for cell in uncertain_cells])
         suspicious_cells = set()
         for cell in uncertain_cells:
             # Một ô đáng ngờ là ô có thể có Wumpus
-            is_wumpus_possible = not inference.ask_Wumpus(kb.wumpus_rules, Literal(f"W{cell.x}{cell.y}", negated=True))
+            is_wumpus_possible = Literal(f"W{cell.x}{cell.y}", negated=True) not in wumpus_entailed
             if is_wumpus_possible:
                 suspicious_cells.add(cell)
         
@@ -267,16 +269,10 @@ class HybridAgent(Agent):
         """"
         Function to find safe cells from uncertain cells
         """
-        safe = set()
         uncertain_cells = self.get_uncertain_cells()
+        statuses = inference.classify_cells(kb.wumpus_rules, kb.pit_rules, uncertain_cells)
 
-        for cell in uncertain_cells:
-            if cell not in self.safe_cells:
-                is_safe = inference.ask_safe(kb.wumpus_rules, kb.pit_rules, cell)
-                if is_safe:
-                    safe.add(cell)
-
-        return safe
+        return {cell for cell, status in statuses.items() if status == CellStatus.SAFE}
     
     def choose_next_decision(self, kb: KB, inference: InferenceEngine):
         """
@@ -2,21 +2,26 @@ from .world import World
 from .agent import Agent, HybridAgent, AdvancedAgent, RandomAgent
 from .knowledge_base import KB
 from .inference import InferenceEngine
+from .solver import SolverBackend, Budget
 from .components import *
 from config import *
 from gui.console_ui import display_world
+import config
 import time
 
 class GamePlay:
 
-    def __init__(self, agent: Agent, display_callback):
+    def __init__(self, agent: Agent, display_callback, solver_backend: str | SolverBackend = None):
+        if solver_backend is None:
+            solver_backend = config.SOLVER_BACKEND # Read now, not at import time: config may still be loading then
         print("-----WUMPUS WORLD AGENT-----\n")
         self.world = World(debug_map=False)
         
         self.last_shot_path = None
         self.agent = agent
         self.kb = KB()
-        self.inference = InferenceEngine()
+        self.inference = InferenceEngine(backend=solver_backend, workers=INFERENCE_WORKERS, parallel_threshold=PARALLEL_FRONTIER_THRESHOLD,
+                                         stats=SOLVER_STATS)
         self.status = GameStatus.IN_PROGRESS
 
         self.learn_from_new_cell(self.agent.location)
@@ -139,6 +144,10 @@ class GamePlay:
             self.agent.planned_action.clear()
             self.agent.just_encountered_danger = False
 
+        if STEP_TIME_BUDGET is not None or STEP_DECISION_BUDGET is not None:
+            # Bounds the solver time of this step, whatever is not proven in time stays uncertain
+            self.inference.budget = Budget(STEP_DECISION_BUDGET, STEP_TIME_BUDGET)
+
         if not self.agent.planned_action:
             self.update_KB_and_inference()
             self.agent.choose_next_decision(self.kb, self.inference)
@@ -204,6 +213,9 @@ class GamePlay:
 
     def update_KB_and_inference(self):
         print(f"\n--- Agent at {self.agent.location} is thinking... ---")
+        if WUMPUS_COUNT_KNOWN and self.kb.wumpus_count is None:
+            # Read from the world actually played, which the GUI may swap in after __init__
+            self.kb.set_wumpus_count(len(self.world.wumpus_locations))
         inference_loop_limit = self.world.size * 2
         loop_count = 0
         
@@ -220,14 +232,15 @@ class GamePlay:
                 cells_to_check.update(self.agent.visited_cells)
                 self.agent.needs_full_rethink = False
 
-            for cell in list(cells_to_check):
-                if cell not in self.agent.safe_cells and self.inference.ask_safe(self.kb.wumpus_rules, self.kb.pit_rules, cell):
+            findings = self.inference.prove_cells(self.kb.wumpus_rules, self.kb.pit_rules, cells_to_check)
+            for cell, (safe, wumpus, pit) in findings.items():
+                if safe and cell not in self.agent.safe_cells:
                     self.agent.safe_cells.add(cell)
                     newly_found_info = True
-                if cell not in self.agent.proven_wumpuses and self.inference.ask_Wumpus(self.kb.wumpus_rules, Literal(f"W{cell.x}{cell.y}")):
+                if wumpus and cell not in self.agent.proven_wumpuses:
                     self.agent.proven_wumpuses.add(cell)
                     newly_found_info = True
-                if cell not in self.agent.proven_pits and self.inference.ask_Pit(self.kb.pit_rules, Literal(f"P{cell.x}{cell.y}")):
+                if pit and cell not in self.agent.proven_pits:
                     self.agent.proven_pits.add(cell)
                     newly_found_info = True
 
@@ -1,31 +1,223 @@
 from .components import *
-from collections import Counter
+from .knowledge_base import Theory
+from .solver import SolverBackend, BACKENDS, BitmaskBackend, create_backend, EntailmentCache, ModelCounter, GibbsSampler, WorkerPool, preprocess, evaluate_assignments
+from .solver import SolverSession, SolverStats, Budget, BudgetExceeded, GridPropagator, AtMost
+from functools import wraps
+from typing import Callable
+import time
+
+def query(method):
+    """
+    Marks a public InferenceEngine method as a query: with statistics enabled, the solver work of
+    the outermost query is counted and timed (see InferenceEngine.stats), nested queries add to it.
+    """
+    @wraps(method)
+    def counted(self, *args, **kwargs):
+        if self.stats is None or self.current is not None:
+            return method(self, *args, **kwargs)
+        return self.run_query(method.__name__, method, args, kwargs)
+    return counted
 
 class InferenceEngine:
     """
-    Implement from scratch using DPLL algorithm (Davis, Putnam, Logemann, Loveland) based on model checking 
-    + Early termination
-    + Pure symbol heuristic
-    + Unit clause heuristic
-    + MOMS (Maximum Occurrences in clauses of Minimum Size) heuristic
+    Answers entailment queries on the KB, on top of a pluggable SAT solver (solver.SolverBackend):
+    DPLL by default, CDCL or the recursive reference DPLL can be selected by name (solver.BACKENDS,
+    "name:option" picks a configuration, e.g. "dpll:vsids"), or any backend instance can be passed in.
+    Clause sets solved from scratch are simplified first (see solver.Preprocessor).
+    With workers > 1, large batches of queries are answered by worker processes (see solver.WorkerPool).
+    With grid=True, cells are classified by solver.GridPropagator first, and with probing=True
+    failed-literal probing (unit propagation only) takes what is left, the SAT solver only sees
+    what neither can decide.
+    With stats=True, every query records its solver counters (solver.SolverStats): the last one in
+    last_query, the running totals in stats; on_query(name, stats) is called after every query.
+    Entailment queries take an optional solver.Budget (or use the engine's `budget`, e.g. one per
+    game step): when it runs out they answer None (unknown) instead of blocking, and cells
+    nothing could be proven about stay uncertain.
+    The at-most constraint of a Theory (Theory.at_most) is handed to every solver along with its clauses.
     """
+
+    def __init__(self, backend: str | SolverBackend = "dpll", cache_size: int = 4096, slicing: bool = True, preprocessing: bool = True,
+                 workers: int = 0, parallel_threshold: int = 16, bitmask_vars: int = 64, grid: bool = True, probing: bool = True,
+                 stats: bool = False, on_query: Callable[[str, SolverStats], None] = None):
+        self.solver = backend if isinstance(backend, SolverBackend) else create_backend(backend)
+        self.backend = self.solver.name
+        # Clause sets solved from scratch with at most bitmask_vars symbols take the bitmask fast path
+        self.scratch_solver = BitmaskBackend(self.solver, bitmask_vars) if bitmask_vars > 0 else self.solver
+        self.cache = EntailmentCache(cache_size)
+        self.justified = EntailmentCache(cache_size) # (theory identity, α) -> justification of KB ╞ α (Theory.justification)
+        self.slicing = slicing # Only solve the cone of influence of the query (Theory.slice)
+        self.preprocessing = preprocessing # Simplify clause sets before solving them from scratch
+        self.counters: dict[tuple, ModelCounter] = {} # (theory name, hazard prefix, prior) -> model counter
+        self.pool = WorkerPool(workers, self.solver, slicing, preprocessing) if workers > 1 else None
+        self.parallel_threshold = parallel_threshold # Fewer pending queries than this are answered serially
+        self.grid = grid # Classify cells with the grid propagator before any SAT call
+        self.grids: dict[tuple, tuple[int, GridPropagator]] = {} # (theory name, hazard prefix) -> (version, propagator)
+        self.probing = probing # Settle what failed-literal probing proves before any SAT call (see probe)
+
+        self.stats: SolverStats = SolverStats() if stats else None # Totals over every query, None = disabled
+        self.last_query: SolverStats = None
+        self.on_query = on_query
+        self.current: SolverStats = None # Counters of the query being answered
+
+        self.budget: Budget = None # Default budget of the entailment queries, None = unbounded
+        self.active_budget: Budget = None # Budget the solvers are charging right now
+
+    def close(self):
+        """Stops the worker processes, if any."""
+        if self.pool is not None:
+            self.pool.close()
+
+    def cache_info(self) -> dict:
+        """Hit/miss counters of the entailment cache."""
+        return self.cache.info()
+
+    def stats_info(self) -> dict:
+        """Solver counters summed over every query so far, empty if statistics are disabled."""
+        return self.stats.as_dict() if self.stats is not None else {}
+
+    def run_query(self, name: str, method, args, kwargs):
+        """Runs a query with every solver counting into a fresh SolverStats, then records it."""
+        stats = self.current = SolverStats(queries=1)
+        self.solver.stats = self.scratch_solver.stats = stats
+        start = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            stats.time = time.perf_counter() - start
+            self.current = self.solver.stats = self.scratch_solver.stats = None
+            self.last_query = stats
+            self.stats.add(stats)
+            if self.on_query is not None:
+                self.on_query(name, stats)
+
+    def session(self, KB: Theory) -> SolverSession:
+        """The incremental session of a theory, counting into the running query (if any)."""
+        session = KB.session
+        session.stats = self.current
+        session.budget = self.active_budget
+        return session
+
+    def within_budget(self, budget: Budget, unknown, method, *args):
+        """Runs method(*args) with every solver charging its decisions to budget, returns `unknown` if it runs out."""
+        self.active_budget = self.solver.budget = self.scratch_solver.budget = budget
+        try:
+            return method(*args)
+        except BudgetExceeded:
+            return unknown
+        finally:
+            self.active_budget = self.solver.budget = self.scratch_solver.budget = None
     
-    def ask_Wumpus(self, KB: set[Clause], alpha: Literal) -> bool:
+    def ask_Wumpus(self, KB: Theory | set[Clause], alpha: Literal, budget: Budget = None) -> bool | None:
         """
         Checks if the Wumpus Knowledge Base (KB) entails a literal (alpha).
         To prove KB ╞ α, we check if (KB ∧ ¬α) is unsatisfiable.
+        None if the budget runs out first.
         """
-        clauses = KB.union({frozenset([alpha.negate()])})
-        return not self.dpll_satisfiable(clauses)
+        return self.entails(KB, alpha, budget)
 
-    def ask_Pit(self, KB: set[Clause], alpha: Literal) -> bool:
+    def ask_Pit(self, KB: Theory | set[Clause], alpha: Literal, budget: Budget = None) -> bool | None:
         """
         Checks if the Pit Knowledge Base (KB) entails a literal (alpha).
+        None if the budget runs out first.
         """
-        clauses = KB.union({frozenset([alpha.negate()])})
-        return not self.dpll_satisfiable(clauses)
+        return self.entails(KB, alpha, budget)
+
+    @query
+    def entails(self, KB: Theory | set[Clause], alpha: Literal, budget: Budget = None) -> bool | None:
+        """
+        Answers for a Theory are cached by (theory, version, α) and reused until the theory changes;
+        a proven α is also kept with its justification and reused until a fact it needed is retracted.
+        An α that a known model of the theory (Theory.witnesses) makes false is not entailed, without search.
+        With slicing, only the cone of influence of α is solved (an inconsistent theory entails everything).
+        With the CDCL backend, a Theory is asked through its incremental session (¬α is an assumption).
+        Otherwise (KB ∧ ¬α) is built and solved from scratch.
+        With a budget (default: self.budget), None (unknown) if it runs out first; unknown is never cached.
+        """
+        budget = budget if budget is not None else self.budget
+        if budget is not None and self.active_budget is None:
+            return self.within_budget(budget, None, self.entails, KB, alpha)
+
+        if not isinstance(KB, Theory):
+            clauses = KB.union({frozenset([alpha.negate()])})
+            return not self.satisfiable(self.prepare(clauses))
+
+        # Most answers follow from unit propagation alone, looked up in O(1)
+        if KB.implied(alpha):
+            return True
+
+        answer = self.cached_answer(KB, alpha)
+        if answer is not None:
+            return answer
+
+        if KB.implied(alpha.negate()) and self.consistent(KB):
+            self.record_answer(KB, alpha, False)
+            return False
+
+        cone = None
+        if self.slicing:
+            if not self.consistent(KB):
+                self.record_answer(KB, alpha, True)
+                return True
+            cone = KB.slice([alpha.name])
+
+        if self.uses_session(KB):
+            session = self.session(KB)
+            answer = session.entails(alpha, within=cone)
+            if not answer:
+                KB.add_witness(session.model()) # The rest of the theory comes from an earlier model
+        else:
+            clauses = cone if cone is not None else KB.clauses
+            answer = not self.satisfiable(self.prepare(clauses.union({frozenset([alpha.negate()])}), at_most=KB.at_most), KB.at_most)
+        self.record_answer(KB, alpha, answer, self.justification(KB, cone) if answer else None)
+        return answer
+
+    @query
+    def entails_many(self, KB: Theory | set[Clause], literals: list[Literal]) -> list[bool]:
+        """
+        Answers KB ╞ α for every literal, in the same order.
+        Literals settled by the closure or the cache are answered here, the rest are fanned out
+        to the worker pool when there are at least parallel_threshold of them.
+        """
+        answers: dict[Literal, bool] = {}
+        pending = []
+        for literal in dict.fromkeys(literals):
+            known = True if isinstance(KB, Theory) and KB.implied(literal) else self.cached_answer(KB, literal)
+            if known is None:
+                pending.append(literal)
+            else:
+                answers[literal] = known
+
+        if self.pool is None or len(pending) < self.parallel_threshold:
+            for literal in pending:
+                answers[literal] = self.entails(KB, literal)
+        else:
+            consistent = isinstance(KB, Theory) and self.slicing and self.consistent(KB)
+            for literal, answer in zip(pending, self.pool.entails(KB, pending, consistent)):
+                answers[literal] = answer
+                self.record_answer(KB, literal, answer)
+
+        return [answers[literal] for literal in literals]
+
+    @query
+    def consistent(self, KB: Theory) -> bool:
+        """
+        Checks (once per theory version) that the whole theory is satisfiable.
+        Cached as the answer to KB ╞ ⊥ (the literal None).
+        """
+        inconsistent = self.cached_answer(KB, None)
+        if inconsistent is None:
+            if self.uses_session(KB) or self.solver.supports_models:
+                model = self.find_model(KB)
+                inconsistent = model is None
+                if model is not None:
+                    KB.add_witness(model)
+            else:
+                inconsistent = not self.satisfiable(KB.clauses, KB.at_most)
+            self.record_answer(KB, None, inconsistent, self.justification(KB) if inconsistent else None)
+        return not inconsistent
     
-    def ask_safe(self, wumpus_kb: set[Clause], pit_kb: set[Clause], cell: Point) -> bool:
+    @query
+    def ask_safe(self, wumpus_kb: Theory | set[Clause], pit_kb: Theory | set[Clause], cell: Point, budget: Budget = None) -> bool:
         """
         Checks if a cell can be proven to be safe.
         A cell is provably safe if AND ONLY IF:
@@ -34,7 +226,11 @@ class InferenceEngine:
         3. We CANNOT prove it HAS a Wumpus (¬(KB ╞ W)).
         4. We CANNOT prove it HAS a Pit (¬(KB ╞ P)).
         Conditions 3 and 4 are crucial for handling inconsistent KBs.
+        If the budget runs out before all four are settled, the cell is not proven safe.
         """
+        budget = budget if budget is not None else self.budget
+        if budget is not None and self.active_budget is None:
+            return self.within_budget(budget, False, self.ask_safe, wumpus_kb, pit_kb, cell)
         
         # 1
         is_wumpus_free = self.ask_Wumpus(wumpus_kb, Literal(f"W{cell.x}{cell.y}", negated=True))
@@ -60,183 +256,406 @@ class InferenceEngine:
 
         return True
     
-    def dpll_satisfiable(self, clauses: set[Clause]) -> bool:
+    @query
+    def backbone(self, KB: Theory | set[Clause], symbols: list[str], budget: Budget = None) -> set[Literal]:
         """
-        Top-level function to check if a set of clauses is satisfiable.
+        Finds which literals among s / ¬s (s in symbols) the KB entails, in one pass:
+        a model refutes every literal it makes false, so after the first model only the
+        literals no model has refuted yet need a proof (KB ∧ ¬l unsatisfiable).
+        Every new model found on the way refutes more candidates at once.
+        If the budget (default: self.budget) runs out, only the literals proven so far are returned.
         """
+        entailed = set()
+        budget = budget if budget is not None else self.budget
+        if budget is not None and self.active_budget is None:
+            self.within_budget(budget, None, self.find_backbone, KB, symbols, entailed)
+        else:
+            self.find_backbone(KB, symbols, entailed)
+        return entailed
 
-        symbols = set()
-        for clause in clauses:
-            for literal in clause:
-                symbols.add(literal.name)
-        
-        # Start the recursive DPLL process.
-        return self.dpll(list(clauses), list(symbols), {})
-    
-    def dpll(self, clauses: list[Clause], symbols: list[str], model: dict[str, bool]) -> bool:
+    def find_backbone(self, KB: Theory | set[Clause], symbols: list[str], entailed: set[Literal]):
+        """backbone() adding every entailed literal to `entailed` as soon as it is proven."""
+        candidates = []
+        for symbol in symbols:
+            for literal in (Literal(symbol), Literal(symbol, negated=True)):
+                if isinstance(KB, Theory) and KB.implied(literal):
+                    entailed.add(literal) # Settled by unit propagation
+                    continue
+                known = self.cached_answer(KB, literal)
+                if known is None:
+                    candidates.append(literal)
+                elif known:
+                    entailed.add(literal)
+
+        if isinstance(KB, Theory) and any(KB.implied(literal.negate()) for literal in candidates) and self.consistent(KB):
+            # The opposite literal follows by unit propagation, so these cannot be entailed
+            for literal in candidates:
+                if KB.implied(literal.negate()):
+                    self.record_answer(KB, literal, False)
+            candidates = [literal for literal in candidates if not KB.implied(literal.negate())]
+
+        if not candidates:
+            return
+
+        if not self.solver.supports_models:
+            # No models to refute candidates with, prove each one
+            for literal in candidates:
+                if self.entails(KB, literal):
+                    entailed.add(literal)
+            return
+
+        names = {literal.name for literal in candidates}
+        cone = None
+        solved = None # What the solver is given, before preprocessing
+        model = None
+        searched = True # False if consistent() answered, maybe without a search
+        if not self.slicing or not isinstance(KB, Theory):
+            if not self.uses_session(KB):
+                cone = self.prepare(KB, names, self.at_most(KB))
+            model = self.find_model(KB, within=cone)
+        elif self.consistent(KB):
+            cone = solved = KB.slice(names)
+            if not self.uses_session(KB):
+                cone = self.prepare(cone, names, KB.at_most)
+            model = self.find_model(KB, within=cone)
+        else:
+            searched = False
+
+        if isinstance(KB, Theory) and model is not None:
+            KB.add_witness(model)
+
+        if model is None:
+            # Inconsistent KB entails everything, justified like KB ╞ ⊥ unless refuted right here
+            justification = None
+            if isinstance(KB, Theory):
+                justification = self.justification(KB, solved) if searched else self.stored_justification(KB, None)
+            for literal in candidates:
+                self.record_answer(KB, literal, True, justification)
+            entailed.update(candidates)
+            return
+
+        at_most = self.at_most(KB)
+        while candidates:
+            if at_most is not None:
+                at_most.complete(model, names) # Members preprocessing left out are unconstrained, False always fits
+            # Drop every candidate the latest model makes false (or leaves free)
+            survivors = []
+            for literal in candidates:
+                if model.get(literal.name) == (not literal.negated):
+                    survivors.append(literal)
+                else:
+                    self.record_answer(KB, literal, False)
+
+            # Try to refute one survivor, until a new model shows up
+            candidates = survivors
+            while candidates:
+                literal = candidates.pop()
+                model = self.find_model(KB, [literal.negate()], within=cone)
+                if model is not None:
+                    self.record_answer(KB, literal, False)
+                    if isinstance(KB, Theory):
+                        KB.add_witness(model)
+                    break
+                entailed.add(literal)
+                self.record_answer(KB, literal, True, self.justification(KB, solved) if isinstance(KB, Theory) else None)
+
+    @query
+    def probability(self, KB: Theory | set[Clause], symbol: str, prior: float) -> float:
         """
-        The recursive core of the DPLL algorithm.
-        model: A dictionary mapping assigned symbol names to their boolean value (True/False).
+        P(symbol | KB) when every symbol of the same kind (same first letter, e.g. all pits)
+        is independently True with probability `prior`, by weighted model counting:
+        WMC(KB ∧ symbol) / WMC(KB). Only the cone of influence of the symbol is counted.
+        Returns 1.0 for an inconsistent KB, like entailment does.
+        The at-most constraint of a theory is not counted, the probability of one of its symbols ignores it.
         """
-        
-        # --- Early Termination ---
-        is_satisfied, is_falsified = self.check_clauses_status(clauses, model)
-        if is_falsified:
-            return False # some clause in clauses is false -> False
-        if is_satisfied:
-            return True # All clauses are satisfied, we have found a valid model.
-
-        # --- Pure Symbol Heuristic---
-        pure_symbol, value = self.find_pure_symbol(clauses, symbols, model)
-        if pure_symbol:
-            new_symbols = [s for s in symbols if s != pure_symbol]
-            new_model = model.copy()
-            new_model[pure_symbol] = value
-            return self.dpll(clauses, new_symbols, new_model)
-
-        # --- Unit Clause Heuristic ---
-        unit_symbol, value = self.find_unit_clause(clauses, model)
-        if unit_symbol:
-            new_symbols = [s for s in symbols if s != unit_symbol]
-            new_model = model.copy()
-            new_model[unit_symbol] = value
-            return self.dpll(clauses, new_symbols, new_model)
-
-        # --- MOMS Heuristic ---
-        symbol_to_try = self.select_symbol_by_MOMS(clauses, symbols, model)
-        if not symbol_to_try:
-             return True # No more symbols to try, must be satisfiable.
-
-        remaining_symbols = [s for s in symbols if s != symbol_to_try]
-
-        # Try assigning True to the chosen symbol
-        model_true = model.copy()
-        model_true[symbol_to_try] = True
-        if self.dpll(clauses, remaining_symbols, model_true):
-            return True
+        if self.slicing and isinstance(KB, Theory):
+            if not self.consistent(KB):
+                return 1.0 # The slice alone may well be consistent
+            clauses = KB.slice([symbol])
+        else:
+            clauses = frozenset(KB)
+
+        name = KB.name if isinstance(KB, Theory) else None
+        key = (name, symbol[0], prior)
+        counter = self.counters.get(key)
+        if counter is None:
+            counter = self.counters[key] = ModelCounter(symbol[0], prior)
+
+        total = counter.count(clauses)
+        if total == 0.0:
+            return 1.0
+        return counter.count(clauses.union({frozenset([Literal(symbol)])})) / total
+
+    @query
+    def sample_probabilities(self, KB: Theory | set[Clause], symbols: list[str], prior: float, samples: int = 20_000,
+                             tolerance: float = None, chains: int = 64, seed: int = None) -> dict[str, float]:
+        """
+        Approximate probability() of every symbol at once (all of the same kind), by Gibbs sampling
+        (solver.GibbsSampler, needs NumPy), for frontiers too long for exact counting.
+        The cone of influence of the symbols is sampled, after eliminating the symbols of other kinds
+        (the percepts, which the hazards around them determine) so that only hazards are resampled.
+        Every chain starts from a model found by the solver. Stops after `samples` samples or once
+        every marginal is within `tolerance` (standard error); the same seed gives the same answer.
+        Returns 1.0 for every symbol of an inconsistent KB, like probability().
+        """
+        if not symbols:
+            return {}
+        if self.slicing and isinstance(KB, Theory):
+            if not self.consistent(KB):
+                return {symbol: 1.0 for symbol in symbols} # The slice alone may well be consistent
+            clauses = KB.slice(symbols)
+        else:
+            clauses = frozenset(KB)
+        prefix = symbols[0][0]
+        hazards = {literal.name for clause in clauses for literal in clause if literal.name.startswith(prefix)}
+        clauses = preprocess(clauses, hazards.union(symbols))
+
+        model = self.scratch_solver.model(clauses)
+        if model is None:
+            return {symbol: 1.0 for symbol in symbols}
+        marginals = GibbsSampler(clauses, prefix, prior, chains, seed).run(model, samples, tolerance)
+        return {symbol: marginals.get(symbol, prior) for symbol in symbols} # A symbol of no clause keeps its prior
 
-        # If assigning True fails, the result of this call is entirely dependent
-        # on the result of assigning False.
-        model_false = model.copy()
-        model_false[symbol_to_try] = False
-        return self.dpll(clauses, remaining_symbols, model_false)
+    @query
+    def entailed_literals(self, KB: Theory | set[Clause], symbols: list[str], budget: Budget = None) -> set[Literal]:
+        """
+        Literals among s / ¬s (s in symbols) that KB entails.
+        With grid reasoning, what the grid propagator forces is settled first; a theory it fully
+        decides never reaches the SAT solver. With probing, the symbols failed-literal probing
+        decides come next. The rest goes to solver_entailed_literals.
+        Probing runs under the budget (default: self.budget) too, if it runs out nothing is proven by probing.
+        """
+        budget = budget if budget is not None else self.budget
+        entailed = set()
+        undecided = symbols
+        if self.grid and isinstance(KB, Theory) and symbols:
+            undecided = []
+            for symbol in symbols:
+                propagator = self.grid_propagator(KB, symbol[0])
+                if propagator.decisive:
+                    entailed.update(propagator.entailed(symbol))
+                else:
+                    for literal in propagator.entailed(symbol):
+                        self.record_answer(KB, literal, True) # The backbone pass skips it
+                    undecided.append(symbol)
+        if self.probing and isinstance(KB, Theory) and undecided:
+            if budget is not None and self.active_budget is None:
+                proven, undecided = self.within_budget(budget, (set(), undecided), self.probe, KB, undecided)
+            else:
+                proven, undecided = self.probe(KB, undecided)
+            entailed |= proven
+        if not undecided:
+            return entailed
+        return entailed | self.solver_entailed_literals(KB, undecided, budget)
+
+    @query
+    def probe(self, KB: Theory, symbols: list[str]) -> tuple[set[Literal], list[str]]:
+        """
+        Failed-literal probing, with unit propagation only: for every symbol s, assumes s then ¬s,
+        and a side that runs into a contradiction proves the other one. What a proven literal
+        propagates to is assumed by the probes that follow, and the symbols left are probed again
+        as long as that proves more. Proven literals are recorded as answers, not told to the theory
+        (a retraction would leave them behind).
+        Returns (entailed literals, symbols that still need a full search). A proven side only
+        decides its symbol once the theory is known to be consistent.
+        """
+        entailed = set()
+        known: set[Literal] = set() # Consequences of the literals proven so far
+        undecided = list(symbols)
+        progress = True
+        while progress and undecided:
+            progress = False
+            remaining = []
+            for symbol in undecided:
+                proven = None
+                for literal in (Literal(symbol), Literal(symbol, negated=True)):
+                    if literal in known or KB.implied(literal):
+                        proven = literal
+                        break
+                    if KB.unit_propagate([literal], known) is None:
+                        proven = literal.negate()
+                        break
+                if proven is None:
+                    remaining.append(symbol)
+                    continue
+                consequences = KB.unit_propagate([proven], known)
+                if consequences is None:
+                    return set(), list(symbols) # Inconsistent, the solver answers for every symbol
+                known |= consequences
+                entailed.add(proven)
+                progress = True
+            undecided = remaining
 
-    def check_clauses_status(self, clauses: list[Clause], model: dict[str, bool]):
+        if entailed and not self.consistent(KB):
+            return set(), list(symbols)
+        for literal in entailed:
+            self.record_answer(KB, literal, True)
+            self.record_answer(KB, literal.negate(), False)
+        return entailed, undecided
+
+    def solver_entailed_literals(self, KB: Theory | set[Clause], symbols: list[str], budget: Budget = None) -> set[Literal]:
+        """
+        entailed_literals with the SAT solver: one backbone pass, or one query per literal spread
+        over the worker pool when there are at least parallel_threshold symbols.
+        Budgeted passes stay serial (the workers cannot be charged).
+        """
+        budget = budget if budget is not None else self.budget
+        if self.pool is None or budget is not None or len(symbols) < self.parallel_threshold:
+            return self.backbone(KB, symbols, budget)
+        literals = [literal for symbol in symbols for literal in (Literal(symbol), Literal(symbol, negated=True))]
+        return {literal for literal, answer in zip(literals, self.entails_many(KB, literals)) if answer}
+
+    @query
+    def prove_cells(self, wumpus_kb: Theory | set[Clause], pit_kb: Theory | set[Clause], cells, budget: Budget = None) -> dict[Point, tuple[bool, bool, bool]]:
         """
-        Checks the status of all clauses against the current model.
-        Returns a tuple: (all_clauses_are_satisfied, any_clause_is_falsified).
+        (safe, wumpus, pit) for every cell, with two backbone passes (one per theory) instead of up to
+        four ask_* calls per cell, large frontiers go to the worker pool (see entailed_literals).
+        Same answers as ask_safe, ask_Wumpus(W) and ask_Pit(P), each one independent of the others.
+        Both passes share the budget (default: self.budget), what is left unproven when it runs out is False.
         """
-        all_satisfied = True
-        for clause in clauses:
-            clause_value = self.evaluate_clause(clause, model)
+        cells = list(cells)
+        wumpus_entailed = self.entailed_literals(wumpus_kb, [f"W{cell.x}{cell.y}" for cell in cells], budget)
+        pit_entailed = self.entailed_literals(pit_kb, [f"P{cell.x}{cell.y}" for cell in cells], budget)
+
+        findings = {}
+        for cell in cells:
+            wumpus, pit = Literal(f"W{cell.x}{cell.y}"), Literal(f"P{cell.x}{cell.y}")
+            wumpus_free = wumpus.negate() in wumpus_entailed
+            pit_free = pit.negate() in pit_entailed
+            is_wumpus = wumpus in wumpus_entailed
+            is_pit = pit in pit_entailed
 
-            if clause_value is False:
-                return False, True # Found a definitively false clause, short-circuit.
-            
-            if clause_value is None:
-                all_satisfied = False # Found an unresolved clause, so not all are satisfied yet.
+            if wumpus_free and pit_free and is_wumpus:
+                print(f"WARNING: Inconsistent KB! Proved both W and ¬W for {cell}")
+            elif wumpus_free and pit_free and is_pit:
+                print(f"WARNING: Inconsistent KB! Proved both P and ¬P for {cell}")
 
-        return all_satisfied, False
+            findings[cell] = (wumpus_free and pit_free and not is_wumpus and not is_pit, is_wumpus, is_pit)
+        return findings
 
-    def evaluate_clause(self, clause: Clause, model: dict[str, bool]):
+    @query
+    def classify_cells(self, wumpus_kb: Theory | set[Clause], pit_kb: Theory | set[Clause], cells, budget: Budget = None) -> dict[Point, CellStatus]:
         """
-        Evaluates a single clause against the current model.
-        Returns: True if the clause is satisfied.
-                 False if the clause is falsified.
-                 None if the clause is still unresolved.
+        One status per cell from prove_cells, a proven Wumpus is reported before a proven Pit.
+        Cells left unproven when the budget (default: self.budget) runs out are UNCERTAIN.
         """
-        has_unassigned_literals = False
-        for literal in clause:
-            if literal.name in model:
-                # Check if the literal's value in the model makes it true
-                if model[literal.name] is not literal.negated:
-                    return True # One true literal makes the whole clause true.
+        statuses = {}
+        for cell, (safe, wumpus, pit) in self.prove_cells(wumpus_kb, pit_kb, cells, budget).items():
+            if wumpus:
+                statuses[cell] = CellStatus.DANGEROUS_WUMPUS
+            elif pit:
+                statuses[cell] = CellStatus.DANGEROUS_PIT
+            elif safe:
+                statuses[cell] = CellStatus.SAFE
             else:
-                has_unassigned_literals = True
-        
-        if has_unassigned_literals:
-            return None # Can't determine final value yet.
-        else:
-            return False # All literals are assigned and all are false.
+                statuses[cell] = CellStatus.UNCERTAIN
+        return statuses
 
-    def find_pure_symbol(self, clauses: list[Clause], symbols: list[str], model: dict[str, bool]):
+    @query
+    def evaluate_assignments(self, KB: Theory | set[Clause], assignments: list[dict[str, bool]]) -> list[bool | None]:
         """
-        Finds a symbol that only appears with one polarity (all positive or all negative) 
-        across all clauses that are not yet satisfied.
+        Checks many candidate (partial) assignments {symbol: value} against the KB in one
+        vectorized call (needs NumPy): True if every clause is satisfied, False if some clause
+        is falsified (or the at-most constraint of the theory is broken), None if it depends on unassigned symbols.
         """
-        unassigned_symbols = {s for s in symbols if s not in model}
-        pure_symbols = {} # {symbol_name: polarity (True/False)}
-        
-        for s in unassigned_symbols:
-            pure_symbols[s] = None
+        results = evaluate_assignments(KB, assignments)
+        at_most = self.at_most(KB)
+        if at_most is None:
+            return results
+        return [result if at_most.holds(assignment) else False for result, assignment in zip(results, assignments)]
+
+    def grid_propagator(self, KB: Theory, hazard_prefix: str) -> GridPropagator:
+        """Grid propagator of a theory for one kind of hazard, built once per theory version."""
+        key = (KB.name, hazard_prefix)
+        version, propagator = self.grids.get(key, (None, None))
+        if version != KB.version:
+            propagator = GridPropagator(KB.clauses, hazard_prefix, KB.at_most)
+            self.grids[key] = (KB.version, propagator)
+        return propagator
 
-        for clause in clauses:
-            if self.evaluate_clause(clause, model) is None:
+    @query
+    def find_model(self, KB: Theory | set[Clause], assumptions: list[Literal] = (), within: frozenset[Clause] = None) -> dict[str, bool] | None:
+        """
+        Returns a model of (KB ∧ assumptions) as {symbol: value}, None if there is none.
+        Symbols missing from the model can take either value.
+        within: a slice of KB to solve instead of the whole KB (symbols outside it are not meaningful).
+        """
+        if self.uses_session(KB):
+            return self.session(KB).find_model(assumptions, within)
 
-                for literal in clause:
-                    if literal.name in pure_symbols:
-                        polarity = not literal.negated
+        clauses = within if within is not None else KB
+        clauses = clauses.union({frozenset([literal]) for literal in assumptions})
+        return self.scratch_solver.model(clauses, self.at_most(KB))
 
-                        if pure_symbols[literal.name] is None:
-                            pure_symbols[literal.name] = polarity
+    def uses_session(self, KB: Theory | set[Clause]) -> bool:
+        """True if queries on KB go through its incremental CDCL session instead of a fresh solver."""
+        return self.solver.incremental and isinstance(KB, Theory)
 
-                        elif pure_symbols[literal.name] != polarity:
-                            del pure_symbols[literal.name]
+    def at_most(self, KB: Theory | set[Clause]) -> AtMost | None:
+        """The at-most constraint that holds on top of the clauses of KB, if any."""
+        return KB.at_most if isinstance(KB, Theory) else None
 
-        # Take pure symbol
-        if pure_symbols:
-            symbol, value = pure_symbols.popitem()
-            return symbol, value
-        
-        return None, None
-
-    def find_unit_clause(self, clauses: list[Clause], model: dict[str, bool]):
-        """
-        Finds a clause that has been reduced to a single unassigned literal.
-        """
-        for clause in clauses:
-            if self.evaluate_clause(clause, model) is None: # Only check unresolved clauses
-                unassigned_literal = None
-                num_unassigned = 0
-
-                for literal in clause:
-                    if literal.name not in model:
-                        num_unassigned += 1
-                        unassigned_literal = literal
-                
-                if num_unassigned == 1:
-                    # This is a unit clause. The literal must be assigned a value to make the clause true.
-                    value = not unassigned_literal.negated
-                    return unassigned_literal.name, value
-                
-        return None, None
-
-    def select_symbol_by_MOMS(self, clauses: list[Clause], symbols: list[str], model: dict[str, bool]) -> str:
-        """Selects the next symbol to branch on using the Degree Heuristic."""
-        unassigned_symbols = [s for s in symbols if s not in model]
-        if not unassigned_symbols:
+    def prepare(self, clauses, keep: set[str] = frozenset(), at_most: AtMost = None) -> set[Clause]:
+        """
+        Clauses to hand to a fresh solver: preprocessed if enabled, the symbols in `keep`
+        are never eliminated so a model still assigns them meaningfully, nor are the members of at_most.
+        """
+        if not self.preprocessing:
+            return clauses
+        if at_most is not None:
+            keep = set(keep).union(literal.name for clause in clauses for literal in clause if at_most.covers(literal.name))
+        return preprocess(clauses, keep)
+
+    def cached_answer(self, KB: Theory | set[Clause], alpha: Literal):
+        """
+        Cached answer to KB ╞ α, None if unknown.
+        An α proven on an earlier version is still entailed if its justification holds,
+        an α some model of the theory makes false is not (with any model, KB ╞ ⊥ is not either).
+        """
+        if not isinstance(KB, Theory):
             return None
+        answer = self.cache.get((KB.name, KB.version, alpha))
+        if answer is None:
+            if self.stored_justification(KB, alpha) is not None:
+                answer = True
+            elif KB.witnesses and (alpha is None or KB.refuted(alpha)):
+                answer = False
+            if answer is not None:
+                self.cache.put((KB.name, KB.version, alpha), answer)
+        return answer
 
-        unresolved_clauses = [c for c in clauses if self.evaluate_clause(c, model) is None]
-        if not unresolved_clauses:
-            return unassigned_symbols[0] # Fallback
-        
-        min_len = float('inf')
-        for c in unresolved_clauses:
-            min_len = min(min_len, len(c))
-
-        # Just find the minimum length clause
-        shortest_clauses = [c for c in unresolved_clauses if len(c) == min_len]
-
-        # Count occurrences of unassigned symbols in unresolved clauses
-        counter = Counter()
-        for c in shortest_clauses:
-            for literal in c:
-                if literal.name in unassigned_symbols:
-                    counter[literal.name] += 1
-        
-        if not counter:
-            return unassigned_symbols[0] # Fallback: just pick the first one
+    def record_answer(self, KB: Theory | set[Clause], alpha: Literal, answer: bool, justification: tuple = None):
+        if isinstance(KB, Theory):
+            self.cache.put((KB.name, KB.version, alpha), answer)
+            if answer and justification is not None:
+                self.justified.put((KB.identity, alpha), justification)
+
+    def stored_justification(self, KB: Theory, alpha: Literal) -> tuple | None:
+        """The justification kept for KB ╞ α, None if there is none or it no longer holds."""
+        justification = self.justified.get((KB.identity, alpha))
+        return justification if justification is not None and KB.justifies(justification) else None
+
+    def justification(self, KB: Theory, within: frozenset[Clause] = None) -> tuple[int, frozenset[Clause], int]:
+        """
+        Justification of the refutation just found on KB: the facts of the session's unsat core,
+        or every fact of the clauses solved from scratch (the slice `within`, or the whole theory).
+        Only valid right after the search that found it (the session keeps the core of its last query).
+        """
+        if self.uses_session(KB):
+            return KB.justification(KB.session.core)
+        clauses = within if within is not None else KB.clauses
+        return KB.justification(clause for clause in clauses if len(clause) == 1)
 
-        # Return the symbol that appears most frequently
-        return counter.most_common(1)[0][0]
\ No newline at end of file
+    @query
+    def satisfiable(self, clauses: set[Clause], at_most: AtMost = None) -> bool:
+        """
+        Checks satisfiability with the selected backend (small clause sets take the bitmask fast path),
+        under the at_most constraint if given.
+        """
+        return self.scratch_solver.satisfiable(clauses, at_most)
+
+    def dpll_satisfiable(self, clauses: set[Clause]) -> bool:
+        """
+        Top-level function to check if a set of clauses is satisfiable with DPLL, whatever the backend.
+        """
+        return BACKENDS["dpll"]().satisfiable(clauses)
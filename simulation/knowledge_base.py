@@ -1,5 +1,273 @@
 from .components import *
+from .solver import SolverSession, AtMost, WitnessPool
 import traceback
+import itertools
+
+class Theory:
+    """
+    One half of the KB (pit rules or wumpus rules).
+    Behaves like the set of clauses it wraps, and pushes every change into an
+    incremental solver session so entailment queries do not start from scratch.
+    Every change gives the theory a new version, drawn from a counter shared by all
+    theories, so (name, version) identifies one exact clause set.
+    A symbol -> clauses index is kept up to date for cone-of-influence slicing.
+    The unit-propagation closure of the theory (every literal that follows from the facts
+    by unit propagation alone) is extended on every tell and rebuilt lazily after a retraction.
+    An optional at-most constraint (solver.AtMost, e.g. the number of wumpuses still alive) holds
+    on top of the clauses; it is solved natively, never expanded to clauses. The closure ignores it,
+    so it stays a subset of what the theory entails.
+    Telling clauses never breaks an entailment, retracting them may: a proof is justified by the
+    facts it used (see justification) and stays valid, whatever the version, until one of them is
+    retracted. Retracting a rule or loosening the at-most constraint starts a new epoch, which
+    invalidates every justification.
+    A small pool of models of the theory (solver.WitnessPool, fed by the inference engine) is kept
+    valid through every change: a literal one of them makes false is not entailed.
+    """
+
+    versions = itertools.count(1)
+    identities = itertools.count(1)
+
+    def __init__(self, name: str):
+        self.name = name
+        self.clauses: set[Clause] = set()
+        self.session = SolverSession()
+        self.version = next(Theory.versions)
+        self.identity = next(Theory.identities) # Tells apart theories of the same name (e.g. the pit rules of two KBs)
+        self.at_most: AtMost = None
+        self.epoch = 0                                # bumped when a rule or a bound is retracted
+
+        self.occurrences: dict[str, set[Clause]] = {} # symbol -> clauses mentioning it
+        self.fact_count: dict[str, int] = {}          # symbol -> number of unit clauses fixing it
+
+        self.closure: set[Literal] = set()            # literals implied by unit propagation
+        self.closure_conflict = False                 # unit propagation derived both l and ¬l
+        self.closure_stale = False                    # a clause was retracted since the last rebuild
+        self.witnesses = WitnessPool()                # models of the current clauses
+
+    def __iter__(self):
+        return iter(self.clauses)
+
+    def __len__(self):
+        return len(self.clauses)
+
+    def __contains__(self, clause: Clause):
+        return clause in self.clauses
+
+    def union(self, other) -> set[Clause]:
+        return self.clauses.union(other)
+
+    def add(self, clause: Clause):
+        if clause not in self.clauses:
+            self.clauses.add(clause)
+            self.session.add_clause(clause)
+            self.version = next(Theory.versions)
+
+            for literal in clause:
+                self.occurrences.setdefault(literal.name, set()).add(clause)
+            if len(clause) == 1:
+                name = next(iter(clause)).name
+                self.fact_count[name] = self.fact_count.get(name, 0) + 1
+
+            if not self.closure_stale:
+                self.extend_closure(clause)
+            if self.witnesses:
+                self.witnesses.tell(clause, self.occurrences, self.at_most)
+
+    def update(self, clauses):
+        for clause in clauses:
+            self.add(clause)
+
+    def discard(self, clause: Clause):
+        if clause in self.clauses:
+            self.clauses.remove(clause)
+            self.version = next(Theory.versions)
+
+            for literal in clause:
+                self.occurrences[literal.name].discard(clause)
+            if len(clause) == 1:
+                self.fact_count[next(iter(clause)).name] -= 1
+            else:
+                self.epoch += 1
+            self.closure_stale = True
+            if not self.session.remove_clause(clause):
+                self.rebuild_session()
+
+    def difference_update(self, clauses):
+        for clause in list(clauses):
+            self.discard(clause)
+
+    def set_at_most(self, at_most: AtMost):
+        """Sets (or with None, drops) the at-most constraint of the theory."""
+        if at_most == self.at_most:
+            return
+        if self.at_most is not None and (at_most is None or at_most.prefix != self.at_most.prefix or at_most.bound > self.at_most.bound):
+            self.epoch += 1 # Looser than before, what followed from the old bound may not hold anymore
+        self.at_most = at_most
+        self.version = next(Theory.versions)
+        self.witnesses.restrict(at_most)
+        if not self.session.set_at_most(at_most):
+            self.rebuild_session()
+
+    def justification(self, facts) -> tuple[int, frozenset[Clause], int]:
+        """Justification of a proof on this theory that used these facts, along with the current rules and at-most constraint."""
+        return self.identity, frozenset(facts), self.epoch
+
+    def justifies(self, justification: tuple[int, frozenset[Clause], int]) -> bool:
+        """True if the justified proof was made on this theory and nothing it used was retracted since, so its conclusion still holds."""
+        identity, facts, epoch = justification
+        return identity == self.identity and epoch == self.epoch and facts <= self.clauses
+
+    def add_witness(self, model: dict[str, bool]) -> bool:
+        """Keeps a model found by a solver (see WitnessPool.add), False if it is not a model of the theory."""
+        return self.witnesses.add(model, self.clauses, self.at_most)
+
+    def refuted(self, literal: Literal) -> bool:
+        """True if a known model makes the literal false, so the theory does not entail it."""
+        return self.witnesses.refutes(literal, self.at_most)
+
+    def implied(self, literal: Literal) -> bool:
+        """
+        O(1) check whether unit propagation from the facts derives the literal
+        (always True once propagation found a contradiction).
+        """
+        if self.closure_stale:
+            self.rebuild_closure()
+        return self.closure_conflict or literal in self.closure
+
+    def rebuild_closure(self):
+        self.closure = set()
+        self.closure_conflict = False
+        self.closure_stale = False
+        for clause in self.clauses:
+            if len(clause) == 1:
+                self.extend_closure(clause)
+
+    def extend_closure(self, clause: Clause):
+        """Adds what a new clause implies under the current closure, then propagates it."""
+        unassigned = [literal for literal in clause if literal.negate() not in self.closure]
+        if any(literal in self.closure for literal in unassigned):
+            return # Already satisfied
+        if not unassigned:
+            self.closure_conflict = True
+        elif len(unassigned) == 1:
+            self.propagate_closure(unassigned[0])
+
+    def propagate_closure(self, literal: Literal):
+        closure = self.closure
+        closure.add(literal)
+        queue = [literal]
+
+        while queue:
+            false_literal = queue.pop().negate()
+            for clause in self.occurrences.get(false_literal.name, ()):
+                if false_literal not in clause:
+                    continue
+
+                unit = None
+                open_literals = 0
+                for other in clause:
+                    if other in closure:
+                        break # Satisfied
+                    if other.negate() not in closure:
+                        open_literals += 1
+                        unit = other
+                else:
+                    if open_literals == 0:
+                        self.closure_conflict = True
+                    elif open_literals == 1:
+                        closure.add(unit)
+                        queue.append(unit)
+
+    def unit_propagate(self, literals, known: set[Literal] = frozenset()) -> set[Literal] | None:
+        """
+        Literals that unit propagation derives from the given ones on top of the closure and of the
+        `known` literals (themselves included), None if it runs into a contradiction.
+        Only the clauses around the derived literals are visited, the closure is left untouched.
+        """
+        if self.closure_stale:
+            self.rebuild_closure()
+        if self.closure_conflict:
+            return None
+        closure = self.closure
+        derived = set()
+        queue = []
+        for literal in literals:
+            if literal.negate() in closure or literal.negate() in known or literal.negate() in derived:
+                return None
+            if literal not in closure and literal not in known and literal not in derived:
+                derived.add(literal)
+                queue.append(literal)
+
+        while queue:
+            false_literal = queue.pop().negate()
+            for clause in self.occurrences.get(false_literal.name, ()):
+                if false_literal not in clause:
+                    continue
+
+                unit = None
+                open_literals = 0
+                for other in clause:
+                    if other in closure or other in known or other in derived:
+                        break # Satisfied
+                    negated = other.negate()
+                    if negated not in closure and negated not in known and negated not in derived:
+                        open_literals += 1
+                        unit = other
+                else:
+                    if open_literals == 0:
+                        return None
+                    if open_literals == 1:
+                        derived.add(unit)
+                        queue.append(unit)
+        return derived
+
+    def slice(self, symbols) -> frozenset[Clause]:
+        """
+        Cone of influence of the given symbols: the clauses connected to them through shared symbols.
+        A symbol fixed by a unit fact cuts the connection, only its facts are included, because
+        once its value is known the clauses on either side of it no longer constrain each other.
+        Clauses already satisfied by a fact constrain nothing and are skipped.
+        The at-most constraint connects all of its symbols: reaching one brings in the others
+        (and the facts fixing them, a True one uses up part of the bound).
+        As long as the whole theory is satisfiable, (slice ∧ ¬α) is satisfiable iff (theory ∧ ¬α) is.
+        """
+        component = set()
+        seen = set(symbols)
+        stack = list(seen)
+        at_most = self.at_most
+
+        while stack:
+            name = stack.pop()
+            fixed = self.fact_count.get(name, 0) > 0
+
+            if at_most is not None and at_most.covers(name):
+                for member in self.occurrences:
+                    if member not in seen and at_most.covers(member):
+                        seen.add(member)
+                        stack.append(member)
+                at_most = None # Every member is on the stack now
+
+            for clause in self.occurrences.get(name, ()):
+                if clause in component:
+                    continue
+                if len(clause) > 1:
+                    if fixed:
+                        continue # Do not expand through a known symbol
+                    if any(frozenset([literal]) in self.clauses for literal in clause):
+                        continue # Satisfied by a fact
+                component.add(clause)
+                for literal in clause:
+                    if literal.name not in seen:
+                        seen.add(literal.name)
+                        stack.append(literal.name)
+
+        return frozenset(component)
+
+    def rebuild_session(self):
+        self.session = SolverSession()
+        for clause in self.clauses:
+            self.session.add_clause(clause)
+        self.session.set_at_most(self.at_most)
 
 class KB:
     """
@@ -9,8 +277,9 @@ class KB:
 
     def __init__(self):
         # Type hint
-        self.pit_rules: set[Clause] = set() 
-        self.wumpus_rules: set[Clause] = set()
+        self.pit_rules: Theory = Theory("pit")
+        self.wumpus_rules: Theory = Theory("wumpus")
+        self.wumpus_count: int = None # Wumpuses still alive, None = unknown
 
     @staticmethod 
     def conversion_to_CNF(left: str, right: list[str]) -> set[Clause]: 
@@ -31,16 +300,14 @@ class KB:
         When in Advanced mode, Agent need to remove Stench, Wumpus out of KB.
         """
 
-        new_wumpus_rules = set()
+        clauses_to_remove = set()
         for clause in self.wumpus_rules:
             if len(clause) == 1: # Literal W, S -> Delete
                 literal = list(clause)[0]
                 if literal.name.startswith('W') or literal.name.startswith('S'):
-                    continue
-
-            new_wumpus_rules.add(clause)
+                    clauses_to_remove.add(clause)
 
-        self.wumpus_rules = new_wumpus_rules  
+        self.wumpus_rules.difference_update(clauses_to_remove)
     
     def retract_all_stench_facts(self):
         """Removes all stench-related facts (Sxy and ¬Sxy) from the wumpus KB."""
@@ -55,39 +322,31 @@ class KB:
     def retract_and_tell_percept_facts(self, cell: Point, new_percepts: set[Percept]):
         x, y = cell.x, cell.y
         
+        # Only the opposite fact is retracted: re-telling an unchanged percept must not
+        # change the theory (its version, cached answers and unit closure stay valid).
+
         # --- STENCH ---
         stench_literal = Literal(f"S{x}{y}")
+        stench_fact = stench_literal if Percept.STENCH in new_percepts else stench_literal.negate()
 
-        self.wumpus_rules.discard(frozenset([stench_literal]))
-        self.wumpus_rules.discard(frozenset([stench_literal.negate()]))
-        
-        if Percept.STENCH in new_percepts:
-            self.tell_fact(stench_literal)
-        else:
-            self.tell_fact(stench_literal.negate())
+        self.wumpus_rules.discard(frozenset([stench_fact.negate()]))
+        self.tell_fact(stench_fact)
 
         # --- BREEZE ---
         breeze_literal = Literal(f"B{x}{y}")
+        breeze_fact = breeze_literal if Percept.BREEZE in new_percepts else breeze_literal.negate()
 
-        self.pit_rules.discard(frozenset([breeze_literal]))
-        self.pit_rules.discard(frozenset([breeze_literal.negate()]))
-
-        if Percept.BREEZE in new_percepts:
-            self.tell_fact(breeze_literal)
-        else:
-            self.tell_fact(breeze_literal.negate())
+        self.pit_rules.discard(frozenset([breeze_fact.negate()]))
+        self.tell_fact(breeze_fact)
             
         # --- GLITTER ---
         glitter_literal = Literal(f"G{x}{y}")
+        glitter_fact = glitter_literal if Percept.GLITTER in new_percepts else glitter_literal.negate()
+
         self.wumpus_rules.discard(frozenset([glitter_literal]))
-        self.pit_rules.discard(frozenset([glitter_literal]))
         self.wumpus_rules.discard(frozenset([glitter_literal.negate()]))
-        self.pit_rules.discard(frozenset([glitter_literal.negate()]))
-
-        if Percept.GLITTER in new_percepts:
-            self.tell_fact(glitter_literal) 
-        else:
-            self.tell_fact(glitter_literal.negate())
+        self.pit_rules.discard(frozenset([glitter_fact.negate()]))
+        self.tell_fact(glitter_fact)
             
     def tell(self, KB_clauses : set[Clause], is_wumpus_rule: bool):
         """
@@ -116,7 +375,18 @@ class KB:
         elif fact_name.startswith('G'):
             self.pit_rules.add(fact_clause)
 
+    def set_wumpus_count(self, count: int | None):
+        """
+        Tells how many wumpuses are alive: at most that many W symbols are True, as one native
+        cardinality constraint on the wumpus rules (never expanded to clauses). None = unknown.
+        """
+        self.wumpus_count = count
+        self.wumpus_rules.set_at_most(AtMost("W", count) if count is not None else None)
+
     def process_scream_event(self):
+        if self.wumpus_count:
+            self.set_wumpus_count(self.wumpus_count - 1) # One wumpus less
+
         clauses_to_remove = set()
         
         for clause in self.wumpus_rules:
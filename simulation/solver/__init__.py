@@ -0,0 +1,19 @@
+from .encoding import SymbolTable, IntClause, compile_clauses, literal_value
+from .cardinality import AtMost
+from .propagation import Propagator
+from .cdcl import CDCLSolver, luby
+from .session import SolverSession
+from .stats import SolverStats
+from .budget import Budget, BudgetExceeded
+from .cache import EntailmentCache
+from .witness import WitnessPool
+from .counting import ModelCounter
+from .sampling import GibbsSampler
+from .grid import GridPropagator
+from .preprocess import Preprocessor, preprocess
+from .heuristics import VSIDS
+from .backends import SolverBackend, BACKENDS, register_backend, create_backend, DPLLBackend, CDCLBackend, ReferenceBackend
+from .parallel import WorkerPool
+from .portfolio import PortfolioBackend
+from .bitmask import BitmaskBackend
+from .vectorized import SignMatrix, NumpyBackend, evaluate_assignments
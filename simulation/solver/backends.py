@@ -0,0 +1,322 @@
+from ..components import Literal, Clause
+from .encoding import IntClause, compile_clauses
+from .propagation import Propagator
+from .cdcl import CDCLSolver
+from .heuristics import VSIDS
+from .stats import SolverStats
+from .budget import Budget
+from .cardinality import AtMost
+from collections import Counter
+
+class SolverBackend:
+    """
+    Interface of the SAT solvers behind InferenceEngine.
+    + satisfiable(clauses): required
+    + entails(clauses, α): KB ╞ α iff (KB ∧ ¬α) is unsatisfiable, derived from satisfiable by default
+    + model(clauses): optional, a model as {symbol: value} or None if there is none.
+      Backends without it set supports_models = False and the engine proves literals one by one.
+    Every method takes an optional at_most constraint (cardinality.AtMost) that holds on top of the clauses.
+    incremental: queries on a Theory may go through its long-lived SolverSession instead.
+    stats: while set (by InferenceEngine), every run adds its counters to it.
+    budget: while set, every decision is charged to it and a run raises BudgetExceeded once it is used up.
+    """
+
+    name: str = None
+    supports_models = True
+    incremental = False
+    stats: SolverStats = None
+    budget: Budget = None
+
+    @property
+    def label(self) -> str:
+        """Name of this configuration of the backend, for reports."""
+        return self.name
+
+    def satisfiable(self, clauses: set[Clause], at_most: AtMost = None) -> bool:
+        return self.model(clauses, at_most) is not None
+
+    def entails(self, clauses: set[Clause], alpha: Literal, at_most: AtMost = None) -> bool:
+        return not self.satisfiable(set(clauses).union({frozenset([alpha.negate()])}), at_most)
+
+    def model(self, clauses: set[Clause], at_most: AtMost = None) -> dict[str, bool] | None:
+        raise NotImplementedError(f"Solver backend '{self.name}' does not produce models")
+
+BACKENDS: dict[str, type[SolverBackend]] = {} # name -> backend class, see register_backend
+
+def register_backend(cls: type[SolverBackend]) -> type[SolverBackend]:
+    """Class decorator that makes a backend selectable by name (InferenceEngine(backend=name))."""
+    BACKENDS[cls.name] = cls
+    return cls
+
+def create_backend(spec: str) -> SolverBackend:
+    """Backend from "name" or "name:option", e.g. "dpll:vsids" = DPLLBackend("vsids")."""
+    name, _, option = spec.partition(":")
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown solver backend '{name}', expected one of {tuple(BACKENDS)}")
+    return BACKENDS[name](option) if option else BACKENDS[name]()
+
+@register_backend
+class DPLLBackend(SolverBackend):
+    """
+    Iterative DPLL (Davis, Putnam, Logemann, Loveland) based on model checking
+    + Early termination
+    + Pure symbol heuristic (at the root, from occurrence lists)
+    + Unit clause heuristic (unit propagation over two watched literals)
+    + MOMS (Maximum Occurrences in clauses of Minimum Size) heuristic, the first
+      unassigned symbol of the first unresolved clause (heuristic="first"), or VSIDS
+      (heuristic="vsids": activities start at the occurrence counts and are bumped by conflicts)
+    """
+
+    name = "dpll"
+    HEURISTICS = ("moms", "first", "vsids")
+
+    def __init__(self, heuristic: str = "moms"):
+        if heuristic not in self.HEURISTICS:
+            raise ValueError(f"Unknown branching heuristic '{heuristic}', expected one of {self.HEURISTICS}")
+        self.heuristic = heuristic
+
+    @property
+    def label(self) -> str:
+        return f"{self.name}-{self.heuristic}"
+
+    def model(self, clauses: set[Clause], at_most: AtMost = None) -> dict[str, bool] | None:
+        """
+        Runs DPLL and returns the model it found, None if the clauses are unsatisfiable.
+        Symbols the search never had to assign are left out of the model (either value works),
+        except the members of at_most, which are then False.
+        The clauses are compiled to signed integer literals first, the search never touches Literal objects.
+        """
+        int_clauses, table = compile_clauses(clauses)
+
+        propagator = Propagator(len(table))
+        pure_literals = []
+        try:
+            if not propagator.add_clauses(int_clauses):
+                return None
+            if at_most is not None:
+                propagator.add_at_most(at_most.variables(table), at_most.bound)
+                if propagator.inconsistent:
+                    return None
+
+            # --- Pure Symbol Heuristic (once, at the root) ---
+            pure_literals = propagator.pure_literals()
+            for pure_literal in pure_literals:
+                propagator.assign(pure_literal)
+
+            # Start the DPLL search.
+            if not self.dpll(propagator):
+                return None
+            model = table.decode_model(propagator.model)
+            return at_most.complete(model, table.names[1:]) if at_most is not None else model
+        finally:
+            if self.stats is not None:
+                self.stats.count_call(len(int_clauses), len(table))
+                self.stats.count_search(pure_literals=len(pure_literals), **propagator.counters())
+
+    def dpll(self, propagator: Propagator) -> bool:
+        """
+        The iterative core of the DPLL algorithm.
+        propagator: holds the clauses, the current model and the assignment trail.
+        Every decision level of the trail is one branching point: the symbol is tried True first,
+        and flipped[level] records that its False branch is being explored.
+        Backtracking undoes the trail in place, nothing is copied and nothing recurses.
+        """
+        flipped: list[bool] = []
+        order = self.initial_order(propagator) if self.heuristic == "vsids" else None
+        budget = self.budget
+
+        while True:
+            # --- Unit Clause Heuristic + Early Termination ---
+            conflict = propagator.propagate()
+            if conflict is None:
+                # --- Branching Heuristic (MOMS by default) ---
+                if order is not None:
+                    symbol_to_try = order.next_unassigned(propagator.model)
+                else:
+                    symbol_to_try = self.select_symbol(propagator.clauses, propagator.model)
+                if not symbol_to_try:
+                    return True # All clauses are satisfied, we have found a valid model.
+
+                if budget is not None:
+                    budget.spend()
+
+                # Try assigning True to the chosen symbol
+                flipped.append(False)
+                propagator.decide(symbol_to_try)
+                continue
+
+            if order is not None:
+                for lit in propagator.clauses[conflict]:
+                    order.bump(abs(lit))
+                order.decay()
+
+            # Some clause is false -> drop the levels whose both branches failed
+            while flipped and flipped[-1]:
+                flipped.pop()
+            if not flipped:
+                return False
+
+            # If assigning True fails, the result of this level is entirely dependent
+            # on the result of assigning False.
+            level = len(flipped) - 1
+            decision = propagator.trail[propagator.trail_lim[level]]
+            if order is not None:
+                for lit in propagator.trail[propagator.trail_lim[level]:]:
+                    order.push(abs(lit))
+            propagator.backtrack(level)
+            flipped[level] = True
+            propagator.decide(-decision)
+
+    def initial_order(self, propagator: Propagator) -> VSIDS:
+        """VSIDS order whose activities start at the number of clauses each variable occurs in."""
+        occurrences = propagator.occurrences
+        initial = [0.0] + [float(len(occurrences.get(var, ())) + len(occurrences.get(-var, ()))) for var in range(1, propagator.num_vars + 1)]
+        return VSIDS(propagator.num_vars, initial=initial)
+
+    def evaluate_clause(self, clause: IntClause, model: list[int]):
+        """
+        Evaluates a single clause against the current model.
+        Returns: True if the clause is satisfied.
+                 False if the clause is falsified.
+                 None if the clause is still unresolved.
+        """
+        has_unassigned_literals = False
+        for lit in clause:
+            value = model[lit] if lit > 0 else -model[-lit]
+            if value > 0:
+                return True # One true literal makes the whole clause true.
+            if value == 0:
+                has_unassigned_literals = True
+
+        if has_unassigned_literals:
+            return None # Can't determine final value yet.
+        else:
+            return False # All literals are assigned and all are false.
+
+    def select_symbol(self, clauses: list[IntClause], model: list[int]) -> int:
+        """Next symbol to branch on with the configured heuristic, None once every clause is satisfied."""
+        if self.heuristic == "first":
+            return self.select_first_unassigned(clauses, model)
+        return self.select_symbol_by_MOMS(clauses, model)
+
+    def select_first_unassigned(self, clauses: list[IntClause], model: list[int]) -> int:
+        """First unassigned symbol of the first unresolved clause."""
+        for c in clauses:
+            if self.evaluate_clause(c, model) is None:
+                for lit in c:
+                    if not model[abs(lit)]:
+                        return abs(lit)
+        return None
+
+    def select_symbol_by_MOMS(self, clauses: list[IntClause], model: list[int]) -> int:
+        """
+        Selects the next symbol to branch on using the Degree Heuristic.
+        Returns None once every clause is satisfied.
+        """
+        unresolved_clauses = [c for c in clauses if self.evaluate_clause(c, model) is None]
+        if not unresolved_clauses:
+            return None
+
+        min_len = float('inf')
+        for c in unresolved_clauses:
+            min_len = min(min_len, len(c))
+
+        # Just find the minimum length clause
+        shortest_clauses = [c for c in unresolved_clauses if len(c) == min_len]
+
+        # Count occurrences of unassigned symbols in unresolved clauses
+        counter = Counter()
+        for c in shortest_clauses:
+            for lit in c:
+                if not model[abs(lit)]:
+                    counter[abs(lit)] += 1
+
+        # Return the symbol that appears most frequently
+        return counter.most_common(1)[0][0]
+
+@register_backend
+class CDCLBackend(SolverBackend):
+    """
+    Conflict-Driven Clause Learning (see CDCLSolver).
+    Queries on a Theory go through its incremental session, other clause sets get a fresh solver.
+    """
+
+    name = "cdcl"
+    incremental = True
+
+    def model(self, clauses: set[Clause], at_most: AtMost = None) -> dict[str, bool] | None:
+        int_clauses, table = compile_clauses(clauses)
+
+        solver = CDCLSolver(len(table))
+        try:
+            if not solver.add_clauses(int_clauses):
+                return None
+            if at_most is not None:
+                solver.add_at_most(at_most.variables(table), at_most.bound)
+            if not solver.solve(budget=self.budget):
+                return None
+            model = table.decode_model(solver.model())
+            return at_most.complete(model, table.names[1:]) if at_most is not None else model
+        finally:
+            if self.stats is not None:
+                self.stats.count_call(len(int_clauses), len(table))
+                self.stats.count_search(**solver.propagator.counters())
+
+@register_backend
+class ReferenceBackend(SolverBackend):
+    """
+    Textbook recursive DPLL straight on Literal clauses, with a dict model copied at every level.
+    Slow, but small enough to check by eye: the other backends are fuzzed against it.
+    """
+
+    name = "reference"
+
+    def model(self, clauses: set[Clause], at_most: AtMost = None) -> dict[str, bool] | None:
+        names = {literal.name for clause in clauses for literal in clause}
+        if self.stats is not None:
+            self.stats.count_call(len(clauses), len(names))
+        model = self.dpll(list(clauses), {}, at_most)
+        return at_most.complete(model, names) if model is not None and at_most is not None else model
+
+    def dpll(self, clauses: list[Clause], model: dict[str, bool], at_most: AtMost = None) -> dict[str, bool] | None:
+        if at_most is not None and not at_most.holds(model):
+            return None
+        unresolved = []
+        for clause in clauses:
+            value = self.evaluate_clause(clause, model)
+            if value is False:
+                return None
+            if value is None:
+                unresolved.append(clause)
+        if not unresolved:
+            return model
+
+        # Unit clause first, then a pure symbol, then the first unassigned symbol both ways
+        for clause in unresolved:
+            free = [literal for literal in clause if literal.name not in model]
+            if len(free) == 1:
+                return self.dpll(unresolved, {**model, free[0].name: not free[0].negated}, at_most)
+
+        polarities: dict[str, set[bool]] = {}
+        for clause in unresolved:
+            for literal in clause:
+                if literal.name not in model:
+                    polarities.setdefault(literal.name, set()).add(not literal.negated)
+        for name, values in polarities.items():
+            if len(values) == 1 and (values == {False} or at_most is None or not at_most.covers(name)):
+                return self.dpll(unresolved, {**model, name: values.pop()}, at_most)
+
+        name = next(iter(polarities))
+        if self.budget is not None:
+            self.budget.spend()
+        return self.dpll(unresolved, {**model, name: True}, at_most) or self.dpll(unresolved, {**model, name: False}, at_most)
+
+    def evaluate_clause(self, clause: Clause, model: dict[str, bool]):
+        """True if satisfied, False if falsified, None if still unresolved."""
+        has_unassigned_literals = False
+        for literal in clause:
+            if literal.name not in model:
+                has_unassigned_literals = True
+            elif model[literal.name] != literal.negated:
+                return True
+        return None if has_unassigned_literals else False
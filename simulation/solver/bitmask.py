@@ -0,0 +1,164 @@
+from ..components import Clause
+from .backends import SolverBackend, register_backend, create_backend
+from .cardinality import AtMost
+
+MaskClause = tuple[int, int] # (bits of the positive literals, bits of the negative literals)
+
+@register_backend
+class BitmaskBackend(SolverBackend):
+    """
+    DPLL for small clause sets (at most max_vars symbols, one bit each).
+    + A clause is a pair of int bitmasks (positive, negative literals), the partial model is
+      two bitmasks (True symbols, False symbols).
+    + Clause status, unit clauses and pure symbols are a few bitwise operations per clause.
+    + The recursion depth is bounded by max_vars.
+    + An at-most-k constraint is one more mask: popcount of its True members against k.
+    Larger clause sets are handed to the fallback backend unchanged.
+    """
+
+    name = "bitmask"
+
+    def __init__(self, fallback: SolverBackend | str = "dpll", max_vars: int = 64):
+        self.fallback = fallback if isinstance(fallback, SolverBackend) else create_backend(fallback)
+        self.max_vars = max_vars
+        self.counts = {} # search counters of the current run (see SolverStats.count_search)
+        self.at_most = (0, 0) # (bits of the members, bound) of the at-most constraint of the current run
+
+    @property
+    def label(self) -> str:
+        return f"{self.name}-{self.fallback.label}"
+
+    def model(self, clauses: set[Clause], at_most: AtMost = None) -> dict[str, bool] | None:
+        encoded = self.encode(clauses)
+        if encoded is None:
+            return self.fallback.model(clauses, at_most)
+        masks, names = encoded
+
+        result = self.run(masks, names, at_most)
+        if result is None:
+            return None
+        true, false = result
+        if at_most is not None:
+            false |= self.at_most[0] & ~true # Free members are False
+        return {name: bool(true >> bit & 1) for bit, name in enumerate(names) if (true | false) >> bit & 1}
+
+    def satisfiable(self, clauses: set[Clause], at_most: AtMost = None) -> bool:
+        encoded = self.encode(clauses)
+        if encoded is None:
+            return self.fallback.satisfiable(clauses, at_most)
+        return self.run(*encoded, at_most) is not None
+
+    def run(self, masks: list[MaskClause], names: list[str], at_most: AtMost = None) -> tuple[int, int] | None:
+        """search() from the empty model, its counters go to stats if set."""
+        self.counts = dict.fromkeys(("decisions", "propagations", "pure_literals", "backtracks", "max_depth"), 0)
+        members = sum(1 << bit for bit, name in enumerate(names) if at_most.covers(name)) if at_most is not None else 0
+        self.at_most = (members, at_most.bound if at_most is not None else 0)
+        num_vars = len(names)
+        result = self.search(masks, 0, 0)
+        if self.stats is not None:
+            self.stats.count_call(len(masks), num_vars)
+            self.stats.count_search(**self.counts)
+        return result
+
+    def encode(self, clauses: set[Clause]) -> tuple[list[MaskClause], list[str]] | None:
+        """Bitmask clauses and the symbol of every bit, None if there are more than max_vars symbols."""
+        bits: dict[str, int] = {}
+        masks = []
+        for clause in clauses:
+            positive = negative = 0
+            for literal in clause:
+                bit = bits.get(literal.name)
+                if bit is None:
+                    if len(bits) == self.max_vars:
+                        return None
+                    bit = bits[literal.name] = len(bits)
+                if literal.negated:
+                    negative |= 1 << bit
+                else:
+                    positive |= 1 << bit
+            if not positive & negative: # Tautologies never constrain anything
+                masks.append((positive, negative))
+        return masks, list(bits)
+
+    def search(self, clauses: list[MaskClause], true: int, false: int, depth: int = 0) -> tuple[int, int] | None:
+        """(True bits, False bits) of a model extending the partial one, None if there is none."""
+        counts = self.counts
+        members, bound = self.at_most
+        while True:
+            # --- Unit propagation + early termination, to a fixpoint ---
+            unresolved = clauses
+            propagating = True
+            while propagating:
+                propagating = False
+                if members:
+                    # At most `bound` members True: a violation fails, reaching it makes the others False
+                    count = (true & members).bit_count()
+                    if count > bound:
+                        return None
+                    forced = members & ~(true | false) if count == bound else 0
+                    if forced:
+                        false |= forced
+                        counts["propagations"] += forced.bit_count()
+                remaining = []
+                for positive, negative in unresolved:
+                    if positive & true or negative & false:
+                        continue # Satisfied
+                    assigned = true | false
+                    free_positive = positive & ~assigned
+                    free_negative = negative & ~assigned
+                    free = free_positive | free_negative
+                    if not free:
+                        return None # Falsified
+                    if free & (free - 1) == 0:
+                        # Unit clause
+                        if free_positive:
+                            true |= free_positive
+                        else:
+                            false |= free_negative
+                        counts["propagations"] += 1
+                        propagating = True
+                    else:
+                        remaining.append((positive, negative))
+                unresolved = remaining
+
+            if not unresolved:
+                return true, false
+            clauses = unresolved
+
+            # --- Pure symbols: free with one polarity only in every unresolved clause ---
+            assigned = true | false
+            positive_symbols = negative_symbols = 0
+            for positive, negative in clauses:
+                positive_symbols |= positive
+                negative_symbols |= negative
+            positive_symbols &= ~assigned
+            negative_symbols &= ~assigned
+            pure_positive = positive_symbols & ~negative_symbols & ~members # True could break the bound
+            pure_negative = negative_symbols & ~positive_symbols
+            if pure_positive or pure_negative:
+                counts["pure_literals"] += (pure_positive | pure_negative).bit_count()
+                true |= pure_positive
+                false |= pure_negative
+                continue
+
+            # --- Branch on a literal of the shortest unresolved clause ---
+            positive, negative = min(clauses, key=lambda clause: ((clause[0] | clause[1]) & ~assigned).bit_count())
+            free_positive = positive & ~assigned
+            if free_positive:
+                bit = free_positive & -free_positive
+                first, second = (true | bit, false), (true, false | bit)
+            else:
+                free_negative = negative & ~assigned
+                bit = free_negative & -free_negative
+                first, second = (true, false | bit), (true | bit, false)
+
+            if self.budget is not None:
+                self.budget.spend()
+            counts["decisions"] += 1
+            counts["max_depth"] = max(counts["max_depth"], depth + 1)
+            result = self.search(clauses, *first, depth + 1)
+            if result is not None:
+                return result
+            counts["backtracks"] += 1
+            counts["decisions"] += 1
+            return self.search(clauses, *second, depth + 1)
@@ -0,0 +1,35 @@
+import time
+
+class BudgetExceeded(Exception):
+    """Raised from inside a solver once the budget of the running query is used up."""
+
+class Budget:
+    """
+    Limit on the search work behind one or more queries: at most max_decisions branching
+    decisions and/or `seconds` of wall-clock time, counted from the creation of the budget.
+    Solvers call spend() at every decision, which raises BudgetExceeded past the limit;
+    InferenceEngine then answers "unknown" (None) instead of blocking.
+    One budget can be shared by every query of a game step to bound the whole step.
+    """
+
+    def __init__(self, max_decisions: int = None, seconds: float = None):
+        self.max_decisions = max_decisions
+        self.deadline = time.perf_counter() + seconds if seconds is not None else None
+        self.decisions = 0
+
+    @property
+    def exhausted(self) -> bool:
+        return (self.max_decisions is not None and self.decisions >= self.max_decisions) or \
+               (self.deadline is not None and time.perf_counter() >= self.deadline)
+
+    def remaining_time(self) -> float | None:
+        """Seconds left before the deadline (0.0 once passed), None without a deadline."""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.perf_counter())
+
+    def spend(self):
+        """Counts one decision, raises BudgetExceeded if the budget was already used up."""
+        if self.exhausted:
+            raise BudgetExceeded()
+        self.decisions += 1
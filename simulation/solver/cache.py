@@ -0,0 +1,43 @@
+from collections import OrderedDict
+
+class EntailmentCache:
+    """
+    Bounded LRU cache of entailment answers keyed by (theory, version, literal).
+    A theory gets a new version on every change, so stale answers are never hit;
+    they simply age out of the cache.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self.entries: OrderedDict[tuple, bool] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key: tuple):
+        """Returns the cached answer or None."""
+        answer = self.entries.get(key)
+        if answer is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return answer
+
+    def put(self, key: tuple, answer: bool):
+        if self.maxsize <= 0:
+            return
+        self.entries[key] = answer
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self.entries), "maxsize": self.maxsize}
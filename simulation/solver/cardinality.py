@@ -0,0 +1,34 @@
+from dataclasses import dataclass
+
+from .encoding import SymbolTable
+
+@dataclass(frozen=True)
+class AtMost:
+    """
+    Native cardinality constraint: at most `bound` of the symbols whose name starts with `prefix`
+    are True (e.g. AtMost("W", 2) while two wumpuses are alive).
+    It covers every such symbol of the clause set it is solved with, including symbols told later,
+    and is never expanded to CNF: the solvers count the True members while they search
+    (see Propagator.add_at_most). A member no clause mentions is free, and False is always
+    a safe value for it, so models report every unassigned member as False.
+    """
+
+    prefix: str
+    bound: int
+
+    def covers(self, name: str) -> bool:
+        return name.startswith(self.prefix)
+
+    def variables(self, table: SymbolTable) -> list[int]:
+        """IDs of the members among the symbols of a table."""
+        return [var for var in range(1, len(table) + 1) if table.names[var].startswith(self.prefix)]
+
+    def holds(self, model: dict[str, bool]) -> bool:
+        return sum(1 for name, value in model.items() if value and name.startswith(self.prefix)) <= self.bound
+
+    def complete(self, model: dict[str, bool], names) -> dict[str, bool]:
+        """Sets the members among `names` the model leaves free to False, in place, and returns the model."""
+        for name in names:
+            if name not in model and name.startswith(self.prefix):
+                model[name] = False
+        return model
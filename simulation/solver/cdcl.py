@@ -0,0 +1,245 @@
+from .encoding import IntClause
+from .propagation import Propagator
+from .heuristics import VSIDS
+from .budget import Budget
+
+def luby(i: int) -> int:
+    """i-th element (1-based) of the Luby restart sequence: 1 1 2 1 1 2 4 1 1 2 ..."""
+    size, power = 1, 0
+    while size < i + 1:
+        power += 1
+        size = 2 * size + 1
+    while size - 1 != i:
+        size = (size - 1) >> 1
+        power -= 1
+        i = i % size
+    return 1 << power
+
+class CDCLSolver:
+    """
+    Conflict-Driven Clause Learning on top of the watched-literal Propagator.
+    + 1-UIP conflict analysis, the learned clause is added to the clause database
+    + Non-chronological backtracking (backjump to the second highest level of the learned clause)
+    + Luby restarts
+    + Phase saving (a variable is re-decided with the polarity it had when it was undone)
+    + Activity-based branching (VSIDS, variables in recent conflicts are tried first)
+    + Native at-most-k constraints, their propagations are explained on demand for the analysis
+    """
+
+    def __init__(self, num_vars: int = 0, restart_base: int = 64, activity_decay: float = 0.95):
+        self.propagator = Propagator(num_vars)
+        self.order = VSIDS(num_vars, activity_decay)
+        self.phase: list[int] = [-1] * (num_vars + 1) # Most symbols (pits, wumpuses) are False
+        self.restart_base = restart_base
+        self.conflicts = 0
+        self.core: list[int] = None # assumptions the last unsatisfiable solve() needed, see analyze_final
+
+    def ensure_vars(self, num_vars: int):
+        self.propagator.ensure_vars(num_vars)
+        self.order.ensure_vars(num_vars)
+        extra = num_vars + 1 - len(self.phase)
+        if extra > 0:
+            self.phase.extend([-1] * extra)
+
+    def add_clause(self, clause: IntClause) -> bool:
+        self.backtrack(0)
+        self.ensure_vars(max((abs(lit) for lit in clause), default=0))
+        return self.propagator.add_clause(clause)
+
+    def add_clauses(self, clauses) -> bool:
+        for clause in clauses:
+            self.add_clause(clause)
+        return not self.propagator.inconsistent
+
+    def add_at_most(self, variables: list[int], bound: int) -> int:
+        """Adds an at-most-k constraint (see Propagator.add_at_most), returns its index."""
+        self.backtrack(0)
+        self.ensure_vars(max(variables, default=0))
+        return self.propagator.add_at_most(variables, bound)
+
+    def extend_at_most(self, index: int, variables: list[int] = (), bound: int = None):
+        """More members and/or a lower bound for an at-most-k constraint."""
+        self.backtrack(0)
+        self.ensure_vars(max(variables, default=0))
+        self.propagator.extend_at_most(index, variables, bound)
+
+    def model(self) -> list[int]:
+        """The flat model found by the last successful solve()."""
+        return list(self.propagator.model)
+
+    def solve(self, assumptions: list[int] = (), decision_vars: list[int] = None, budget: Budget = None) -> bool:
+        """
+        Returns True if the clause database is satisfiable together with the assumptions.
+        Assumptions are decided first, one per decision level, so everything learned
+        under them only depends on the clause database and stays valid for later calls.
+        decision_vars restricts branching to a slice of the variables: the search stops as
+        soon as those are assigned without conflict (the caller guarantees the rest is satisfiable).
+        budget: every decision is charged to it, BudgetExceeded is raised once it is used up
+        (the solver stays usable, the next solve() starts from level 0).
+        When it returns False, core holds the assumptions the refutation used (empty if the
+        clause database alone is unsatisfiable), None otherwise.
+        """
+        propagator = self.propagator
+        self.core = None
+        self.backtrack(0)
+        if propagator.propagate() is not None:
+            propagator.inconsistent = True
+            self.core = []
+            return False
+
+        restarts = 0
+        conflicts_until_restart = self.restart_base * luby(restarts)
+
+        while True:
+            conflict = propagator.propagate()
+
+            if conflict is not None:
+                self.conflicts += 1
+                if propagator.decision_level == 0:
+                    propagator.inconsistent = True
+                    self.core = []
+                    return False
+
+                learned, backjump_level = self.analyze(conflict)
+                self.backtrack(backjump_level)
+                if len(learned) == 1:
+                    propagator.assign(learned[0])
+                else:
+                    propagator.assign(learned[0], propagator.add_learned_clause(learned))
+                self.decay_activities()
+
+                conflicts_until_restart -= 1
+                continue
+
+            if conflicts_until_restart <= 0:
+                restarts += 1
+                conflicts_until_restart = self.restart_base * luby(restarts)
+                self.backtrack(0)
+                continue
+
+            # Re-establish the assumptions that are not on the trail anymore
+            if propagator.decision_level < len(assumptions):
+                lit = assumptions[propagator.decision_level]
+                value = propagator.value(lit)
+                if value < 0:
+                    self.core = self.analyze_final(lit)
+                    return False # The clauses and earlier assumptions refute this one
+                if value > 0:
+                    propagator.new_decision_level() # Already implied, keep levels aligned
+                else:
+                    propagator.decide(lit)
+                continue
+
+            if budget is not None:
+                budget.spend() # Before the heap pops a variable, which must not get lost
+            var = self.pick_branch_variable(decision_vars)
+            if var is None:
+                return True # Every variable is assigned without conflict
+            propagator.decide(var if self.phase[var] > 0 else -var)
+
+    def analyze(self, conflict: int) -> tuple[list[int], int]:
+        """
+        Derives the first-UIP clause from a conflict.
+        Returns (learned clause with the asserting literal first, level to backjump to).
+        """
+        propagator = self.propagator
+        levels = propagator.levels
+        trail = propagator.trail
+        current_level = propagator.decision_level
+
+        learned = [0] # Slot for the asserting literal
+        seen = set()
+        pending = 0 # Literals of the current level still to resolve
+        resolved = 0
+        index = len(trail) - 1
+        clause = propagator.clauses[conflict]
+
+        while True:
+            for lit in clause:
+                var = abs(lit)
+                if lit == resolved or var in seen or levels[var] == 0:
+                    continue
+                seen.add(var)
+                self.bump_activity(var)
+                if levels[var] == current_level:
+                    pending += 1
+                else:
+                    learned.append(lit)
+
+            # Walk back to the latest trail literal that takes part in the conflict
+            while abs(trail[index]) not in seen:
+                index -= 1
+            resolved = trail[index]
+            index -= 1
+            pending -= 1
+            if pending == 0:
+                break
+            clause = propagator.reason(abs(resolved))
+
+        learned[0] = -resolved
+
+        if len(learned) == 1:
+            return learned, 0
+
+        # Second watch = literal with the highest level, which is also the backjump level
+        highest = max(range(1, len(learned)), key=lambda i: levels[abs(learned[i])])
+        learned[1], learned[highest] = learned[highest], learned[1]
+        return learned, levels[abs(learned[1])]
+
+    def analyze_final(self, lit: int) -> list[int]:
+        """
+        Assumptions that refute the assumption lit (lit included): the decisions the implication
+        graph of ¬lit leads back to. Every decision on the trail is an assumption at that point.
+        """
+        propagator = self.propagator
+        levels = propagator.levels
+        core = [lit]
+        if levels[abs(lit)] == 0:
+            return core # Refuted by the clause database alone
+        seen = {abs(lit)}
+        for assigned in reversed(propagator.trail[propagator.trail_lim[0]:]):
+            var = abs(assigned)
+            if var not in seen:
+                continue
+            if propagator.reasons[var] == -1:
+                core.append(assigned)
+                continue
+            for other in propagator.reason(var):
+                if levels[abs(other)] > 0:
+                    seen.add(abs(other))
+        return core
+
+    def backtrack(self, level: int):
+        """Backjumps to the given level, saving the phase of every undone variable and putting it back in the branching heap."""
+        propagator = self.propagator
+        if propagator.decision_level <= level:
+            return
+        phase = self.phase
+        push = self.order.push
+        for lit in propagator.trail[propagator.trail_lim[level]:]:
+            phase[abs(lit)] = 1 if lit > 0 else -1
+            push(abs(lit))
+        propagator.backtrack(level)
+
+    def bump_activity(self, var: int):
+        self.order.bump(var)
+
+    def decay_activities(self):
+        self.order.decay()
+
+    def pick_branch_variable(self, decision_vars: list[int] = None):
+        """
+        Unassigned variable with the highest activity, None if all are assigned.
+        Popped from the VSIDS heap, or found by a scan of decision_vars (a slice is small,
+        and the heap would have to set aside every more active variable outside it).
+        """
+        model = self.propagator.model
+        if decision_vars is None:
+            return self.order.next_unassigned(model)
+
+        activity = self.order.activity
+        best, best_activity = None, -1.0
+        for var in decision_vars:
+            if not model[var] and activity[var] > best_activity:
+                best, best_activity = var, activity[var]
+        return best
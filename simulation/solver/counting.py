@@ -0,0 +1,122 @@
+from .encoding import SymbolTable
+
+class ModelCounter:
+    """
+    Exact weighted model counting (#SAT) with component caching.
+    + Hazard symbols (names starting with `prefix`, e.g. "P") are True with probability `prior`,
+      every other symbol (percepts) weighs 1 for both values, since the rules determine it.
+    + Unit clauses are propagated before branching.
+    + Clauses that share no variable are split into components and counted separately,
+      the count of every component is cached, so the same frontier region is never counted twice.
+    The symbol table and the cache live as long as the counter, so they carry over between queries.
+    """
+
+    def __init__(self, prefix: str, prior: float, cache_size: int = 200_000):
+        self.prefix = prefix
+        self.prior = prior
+        self.table = SymbolTable()
+        self.weights: list[tuple[float, float]] = [(1.0, 1.0)] # var -> (weight if True, weight if False)
+        self.cache: dict[frozenset, float] = {}
+        self.cache_size = cache_size
+
+    def encode(self, clauses) -> frozenset[tuple[int, ...]]:
+        encoded = set()
+        for clause in clauses:
+            literals = self.table.encode_clause(clause)
+            if any(-lit in literals for lit in literals):
+                continue # Tautology
+            encoded.add(tuple(sorted(set(literals))))
+
+        for var in range(len(self.weights), len(self.table) + 1):
+            if self.table.names[var].startswith(self.prefix):
+                self.weights.append((self.prior, 1.0 - self.prior))
+            else:
+                self.weights.append((1.0, 1.0))
+        return frozenset(encoded)
+
+    def count(self, clauses) -> float:
+        """Weighted model count of the clauses, over the symbols appearing in them."""
+        if len(self.cache) > self.cache_size:
+            self.cache.clear()
+        return self.count_clauses(self.encode(clauses))
+
+    def count_clauses(self, clauses: frozenset[tuple[int, ...]]) -> float:
+        if not clauses:
+            return 1.0
+        cached = self.cache.get(clauses)
+        if cached is not None:
+            return cached
+
+        variables = {abs(lit) for clause in clauses for lit in clause}
+        unit = next((clause[0] for clause in clauses if len(clause) == 1), None)
+
+        if unit is not None:
+            result = self.branch(clauses, variables, unit) # The opposite branch counts 0
+        else:
+            components = self.split_components(clauses)
+            if len(components) > 1:
+                result = 1.0
+                for component in components:
+                    result *= self.count_clauses(component)
+                    if result == 0.0:
+                        break
+            else:
+                var = self.select_variable(clauses)
+                result = self.branch(clauses, variables, var) + self.branch(clauses, variables, -var)
+
+        self.cache[clauses] = result
+        return result
+
+    def branch(self, clauses: frozenset, variables: set[int], lit: int) -> float:
+        """Weight of the literal times the count of the clauses it leaves."""
+        reduced = []
+        for clause in clauses:
+            if lit in clause:
+                continue # Satisfied
+            if -lit in clause:
+                clause = tuple(other for other in clause if other != -lit)
+                if not clause:
+                    return 0.0 # Falsified
+            reduced.append(clause)
+        reduced = frozenset(reduced)
+
+        var = abs(lit)
+        weight = self.weights[var][0 if lit > 0 else 1]
+
+        # Variables that no longer appear anywhere can take both values
+        remaining = {abs(other) for clause in reduced for other in clause}
+        for free_var in variables:
+            if free_var != var and free_var not in remaining:
+                weight *= self.weights[free_var][0] + self.weights[free_var][1]
+
+        return weight * self.count_clauses(reduced)
+
+    def split_components(self, clauses: frozenset) -> list[frozenset]:
+        """Groups the clauses into sets that share no variable (union-find over variables)."""
+        parent: dict[int, int] = {}
+
+        def find(var):
+            while parent.setdefault(var, var) != var:
+                parent[var] = parent[parent[var]]
+                var = parent[var]
+            return var
+
+        for clause in clauses:
+            root = find(abs(clause[0]))
+            for lit in clause[1:]:
+                other = find(abs(lit))
+                if other != root:
+                    parent[other] = root
+
+        groups: dict[int, list] = {}
+        for clause in clauses:
+            groups.setdefault(find(abs(clause[0])), []).append(clause)
+        return [frozenset(group) for group in groups.values()]
+
+    def select_variable(self, clauses: frozenset) -> int:
+        """Variable with the most occurrences, it splits the component fastest."""
+        occurrences: dict[int, int] = {}
+        for clause in clauses:
+            for lit in clause:
+                occurrences[abs(lit)] = occurrences.get(abs(lit), 0) + 1
+        return max(occurrences, key=occurrences.get)
@@ -0,0 +1,56 @@
+from ..components import Literal, Clause
+
+# Internal literal: a signed integer (+v for the symbol, -v for its negation)
+IntClause = tuple[int, ...]
+
+class SymbolTable:
+    """
+    Bidirectional mapping between symbol names ("W34", "P12", ...) and the
+    integer variable IDs used inside the solvers.
+    IDs start at 1 so a literal can be stored as +id / -id and a model can be a
+    flat list indexed by ID (index 0 is unused).
+    """
+
+    def __init__(self):
+        self.ids: dict[str, int] = {}
+        self.names: list[str] = [None]
+
+    def __len__(self) -> int:
+        return len(self.names) - 1
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.ids
+
+    def variable(self, name: str) -> int:
+        """Returns the ID of a symbol, allocating a new one on first use."""
+        var = self.ids.get(name)
+        if var is None:
+            var = len(self.names)
+            self.ids[name] = var
+            self.names.append(name)
+        return var
+
+    def encode_literal(self, literal: Literal) -> int:
+        var = self.variable(literal.name)
+        return -var if literal.negated else var
+
+    def decode_literal(self, lit: int) -> Literal:
+        return Literal(self.names[abs(lit)], negated=lit < 0)
+
+    def encode_clause(self, clause: Clause) -> IntClause:
+        return tuple(self.encode_literal(literal) for literal in clause)
+
+    def decode_model(self, model: list[int]) -> dict[str, bool]:
+        """Translates a flat model (1 = True, -1 = False, 0 = unassigned) back to symbol names."""
+        return {self.names[var]: model[var] > 0 for var in range(1, len(self.names)) if model[var]}
+
+def compile_clauses(clauses) -> tuple[list[IntClause], SymbolTable]:
+    """
+    Compiles a set of Literal clauses into the compact integer form used by the solvers.
+    """
+    table = SymbolTable()
+    return [table.encode_clause(clause) for clause in clauses], table
+
+def literal_value(model: list[int], lit: int) -> int:
+    """Value of a signed literal under a flat model: 1 = True, -1 = False, 0 = unassigned."""
+    return model[lit] if lit > 0 else -model[-lit]
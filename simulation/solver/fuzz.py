@@ -0,0 +1,131 @@
+"""
+Differential fuzzing of the solver backends on Wumpus-shaped queries.
+
+Every instance is a random World, explored from the start cell the way the agent would
+(facts and percept rules told through KB), queried with P/W literals of the frontier cells.
+Each registered backend answers every query, disagreements and timings are reported.
+Wumpus queries are solved under the known wumpus count (an AtMost constraint).
+With --workers N, every backend also answers the same queries from the processes of an
+InferenceEngine worker pool (whole theories, no slicing), checked against the direct answers.
+
+    python -m simulation.solver.fuzz --trials 200 --size 8 --seed 0
+"""
+import argparse
+import random
+import sys
+import time
+
+from ..components import Literal, Point, Percept, get_adjacent_cells
+from ..world import World
+from ..knowledge_base import KB, Theory
+from .backends import BACKENDS, create_backend
+from .cardinality import AtMost
+
+def random_instance(seed: int, size: int, pit_prob: float, number_of_wumpus: int, noise: float):
+    """
+    Builds the pit and wumpus clause sets of an agent that explored part of a random world,
+    plus the number of wumpuses and the frontier cells to ask about. With probability `noise` one percept fact is flipped,
+    which may make the KB inconsistent (every query is then entailed).
+    """
+    random.seed(seed) # World draws from the global generator
+    world = World(size, pit_prob, number_of_wumpus)
+    rng = random.Random(seed)
+
+    def hazardous(cell: Point) -> bool:
+        return bool({'P', 'W'} & world.state[cell.y][cell.x])
+
+    # Random safe region grown from the start cell
+    explored = [Point(0, 0)]
+    frontier = {cell for cell in get_adjacent_cells(Point(0, 0), size) if not hazardous(cell)}
+    for _ in range(rng.randint(0, size * size // 2)):
+        if not frontier:
+            break
+        cell = rng.choice(sorted(frontier, key=lambda p: (p.x, p.y)))
+        frontier.discard(cell)
+        explored.append(cell)
+        frontier.update(other for other in get_adjacent_cells(cell, size) if not hazardous(other) and other not in explored)
+
+    kb = KB()
+    for cell in explored:
+        kb.tell_fact(Literal(f"P{cell.x}{cell.y}", negated=True))
+        kb.tell_fact(Literal(f"W{cell.x}{cell.y}", negated=True))
+        adj_cells = get_adjacent_cells(cell, size)
+        kb.tell(KB.conversion_to_CNF(f"B{cell.x}{cell.y}", [f"P{p.x}{p.y}" for p in adj_cells]), is_wumpus_rule=False)
+        kb.tell(KB.conversion_to_CNF(f"S{cell.x}{cell.y}", [f"W{p.x}{p.y}" for p in adj_cells]), is_wumpus_rule=True)
+        kb.retract_and_tell_percept_facts(cell, world.get_percepts(cell))
+
+    if rng.random() < noise:
+        cell = rng.choice(explored)
+        flipped = rng.choice([Percept.BREEZE, Percept.STENCH])
+        kb.retract_and_tell_percept_facts(cell, world.get_percepts(cell) ^ {flipped})
+
+    cells = sorted({other for cell in explored for other in get_adjacent_cells(cell, size)} - set(explored), key=lambda p: (p.x, p.y))
+    return set(kb.pit_rules), set(kb.wumpus_rules), len(world.wumpus_locations), cells
+
+def run(trials: int, size: int, seed: int, pit_prob: float, number_of_wumpus: int, noise: float, backends: list[str],
+        workers: int = 0) -> int:
+    """Runs the fuzzing campaign and prints a report. Returns the number of disagreements."""
+    from ..inference import InferenceEngine
+
+    solvers = {name: create_backend(name) for name in backends}
+    engines = {name: InferenceEngine(name, slicing=False, workers=workers, parallel_threshold=1) for name in backends} if workers > 1 else {}
+    timings = {name: 0.0 for name in backends}
+    queries = 0
+    disagreements = 0
+
+    for trial in range(seed, seed + trials):
+        pit_clauses, wumpus_clauses, wumpus_count, cells = random_instance(trial, size, pit_prob, number_of_wumpus, noise)
+        for clauses, prefix, at_most in ((pit_clauses, "P", None), (wumpus_clauses, "W", AtMost("W", wumpus_count))):
+            literals = [Literal(f"{prefix}{cell.x}{cell.y}", negated) for cell in cells for negated in (False, True)]
+            expected = {}
+            for alpha in literals:
+                answers = {}
+                for name, solver in solvers.items():
+                    start = time.perf_counter()
+                    answers[name] = solver.entails(clauses, alpha, at_most)
+                    timings[name] += time.perf_counter() - start
+                queries += 1
+                expected[alpha] = answers[backends[0]]
+
+                if len(set(answers.values())) > 1:
+                    disagreements += 1
+                    print(f"DISAGREEMENT seed={trial} query={alpha} answers={answers} ({len(clauses)} clauses)")
+
+            if literals and engines:
+                theory = Theory(prefix)
+                theory.update(clauses)
+                theory.set_at_most(at_most)
+                for name, engine in engines.items():
+                    for alpha, answer in zip(literals, engine.entails_many(theory, literals)):
+                        if answer != expected[alpha]:
+                            disagreements += 1
+                            print(f"POOL DISAGREEMENT seed={trial} backend={name} query={alpha} pool={answer} direct={expected[alpha]}")
+
+    for engine in engines.values():
+        engine.close()
+
+    print(f"{trials} worlds ({size}x{size}), {queries} queries, {disagreements} disagreements")
+    for name in backends:
+        print(f"  {name:<10} {timings[name]:8.3f}s total  {1000 * timings[name] / max(queries, 1):8.3f}ms/query")
+        if hasattr(solvers[name], "win_rates"):
+            rates = ", ".join(f"{label} {rate:.0%}" for label, rate in solvers[name].win_rates().items())
+            print(f"  {'':<10} wins: {rates}")
+    return disagreements
+
+def main(argv: list[str] = None):
+    parser = argparse.ArgumentParser(description="Differential fuzzing of the SAT backends on random Wumpus worlds.")
+    parser.add_argument("--trials", type=int, default=100, help="number of random worlds")
+    parser.add_argument("--size", type=int, default=6, help="map size")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first world")
+    parser.add_argument("--pit-prob", type=float, default=0.2)
+    parser.add_argument("--wumpus", type=int, default=2, help="number of wumpuses")
+    parser.add_argument("--noise", type=float, default=0.2, help="probability of flipping one percept fact")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), help="backend names, or name:option (e.g. dpll:vsids)")
+    parser.add_argument("--workers", type=int, default=0, help="also answer every query from a worker pool of this size (> 1)")
+    args = parser.parse_args(argv)
+
+    disagreements = run(args.trials, args.size, args.seed, args.pit_prob, args.wumpus, args.noise, args.backends, args.workers)
+    sys.exit(1 if disagreements else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+from ..components import Literal
+from .cardinality import AtMost
+
+class GridPropagator:
+    """
+    SAT-free reasoning over one theory of the KB, Minesweeper style.
+    The rules of a visited cell say that its percept X (Bxy / Sxy) is True iff at least one of the
+    hazards around it (Pxy / Wxy, the neighbour set N(X)) is; the facts fix percepts and hazards.
+    Propagation to a fixpoint, with F the hazards proven free:
+    + X False: every hazard of N(X) is free (forced safe)
+    + X True: if N(X) - F is a single hazard, it is there (forced hazard); if it is empty, contradiction
+    + a hazard present makes every percept around it True, N(X) ⊆ F makes X False
+    For a theory made only of such rules and of facts (`complete`), this decides everything:
+    a hazard literal is entailed iff it was forced, and the theory is consistent iff no contradiction
+    showed up. Otherwise the forced literals still hold, the rest needs the SAT solver.
+    With at most k hazards (at_most, e.g. the wumpuses still alive), m of them forced and T the
+    True percepts not explained yet (at least two open hazards each):
+    + m > k: contradiction, m = k: every other hazard is free
+    + k - m disjoint sets among T each hold one hazard, every hazard outside them is free
+      (k - m = 1: the hazard is in the intersection of all of T)
+    Beyond that the bound is only decided when it cannot bind: with k - m > |T| every choice of
+    one open hazard per set of T, plus any other hazard, fits within it.
+    """
+
+    def __init__(self, clauses, hazard_prefix: str, at_most: AtMost = None):
+        self.hazard_prefix = hazard_prefix
+        self.neighbours: dict[str, frozenset[str]] = {} # percept -> hazards it reports on
+        self.percepts: dict[str, list[str]] = {}        # hazard -> percepts reporting on it
+        self.hazards: set[str] = set()                  # every hazard of the theory
+        self.values: dict[str, bool] = {}               # forced symbols
+        self.complete = True
+        self.conflict = False
+        self.bound = None                               # k of an at-most constraint on the hazards
+        self.slack = None                               # k - m - |T| after propagation
+        self.possible: set[str] = None                  # the only hazards that can still be present, None = any
+
+        if at_most is not None:
+            if at_most.prefix == hazard_prefix:
+                self.bound = at_most.bound
+            else:
+                self.complete = False # A constraint on other symbols, sound to ignore
+
+        rules: dict[str, list[frozenset[str]]] = {}   # percept -> hazard sets of its X → (H1 ∨ H2 ...) clauses
+        reporters: dict[str, set[str]] = {}           # percept -> hazards of its H → X clauses
+        facts = []
+        for clause in clauses:
+            self.hazards.update(literal.name for literal in clause if self.is_hazard(literal.name))
+            if len(clause) == 1:
+                facts.append(next(iter(clause)))
+                continue
+            negative = [literal for literal in clause if literal.negated]
+            positive = [literal for literal in clause if not literal.negated]
+            if len(negative) == 1 and not self.is_hazard(negative[0].name) and all(self.is_hazard(literal.name) for literal in positive):
+                rules.setdefault(negative[0].name, []).append(frozenset(literal.name for literal in positive))
+            elif len(clause) == 2 and len(negative) == 1 and self.is_hazard(negative[0].name) and not self.is_hazard(positive[0].name):
+                reporters.setdefault(positive[0].name, set()).add(negative[0].name)
+            else:
+                self.complete = False # Not a grid rule, still sound to ignore but no longer decisive
+
+        # Only X ⇔ (H1 ∨ H2 ...) is a grid rule: one "at least one" clause and its converse
+        for percept in rules.keys() | reporters.keys():
+            hazard_sets = rules.get(percept, [])
+            if len(hazard_sets) != 1 or reporters.get(percept, set()) != hazard_sets[0]:
+                self.complete = False
+                continue
+            self.neighbours[percept] = hazard_sets[0]
+            for hazard in hazard_sets[0]:
+                self.percepts.setdefault(hazard, []).append(percept)
+
+        self.propagate(facts)
+
+    def is_hazard(self, name: str) -> bool:
+        return name.startswith(self.hazard_prefix)
+
+    def propagate(self, facts: list[Literal]):
+        queue = []
+        for fact in facts:
+            self.assign(fact.name, not fact.negated, queue)
+
+        while not self.conflict:
+            while queue and not self.conflict:
+                name = queue.pop()
+                if name in self.neighbours:
+                    self.check(name, queue)
+                for percept in self.percepts.get(name, ()):
+                    self.check(percept, queue)
+            if self.bound is None or self.conflict:
+                break
+            self.count(queue)
+            if not queue:
+                break
+
+    def count(self, queue: list[str]):
+        """Applies the at-most constraint on the hazards under the current values, records the slack."""
+        values = self.values
+        forced = sum(1 for hazard in self.hazards if values.get(hazard) is True)
+        unexplained = []
+        for percept, hazards in self.neighbours.items():
+            if values.get(percept) is True and not any(values.get(hazard) is True for hazard in hazards):
+                unexplained.append(frozenset(hazard for hazard in hazards if hazard not in values))
+
+        left = self.bound - forced
+        self.slack = left - len(unexplained)
+        if left < 0:
+            self.conflict = True
+            return
+        if left == 0:
+            self.possible = set()
+        elif left == 1 and unexplained:
+            self.possible = frozenset.intersection(*unexplained)
+        else:
+            # Greedy disjoint sets, smallest first
+            disjoint = []
+            for hazards in sorted(unexplained, key=len):
+                if all(hazards.isdisjoint(other) for other in disjoint):
+                    disjoint.append(hazards)
+            if len(disjoint) < left:
+                self.possible = None
+                return
+            self.possible = set().union(*disjoint)
+
+        for hazard in self.hazards:
+            if hazard not in values and hazard not in self.possible:
+                self.assign(hazard, False, queue)
+
+    def assign(self, name: str, value: bool, queue: list[str]):
+        known = self.values.get(name)
+        if known is None:
+            self.values[name] = value
+            queue.append(name)
+        elif known != value:
+            self.conflict = True
+
+    def check(self, percept: str, queue: list[str]):
+        """Applies X ⇔ (H1 ∨ H2 ...) under the current values."""
+        values = self.values
+        hazards = self.neighbours[percept]
+        if any(values.get(hazard) is True for hazard in hazards):
+            self.assign(percept, True, queue)
+            return
+        open_hazards = [hazard for hazard in hazards if hazard not in values] # N(X) - F
+        value = values.get(percept)
+        if not open_hazards:
+            self.assign(percept, False, queue)
+        elif value is False:
+            for hazard in open_hazards:
+                self.assign(hazard, False, queue)
+        elif value is True and len(open_hazards) == 1:
+            self.assign(open_hazards[0], True, queue)
+
+    def entailed(self, symbol: str) -> set[Literal]:
+        """
+        Literals on the symbol that were forced (both of them after a contradiction).
+        A hazard no clause mentions is still subject to the at-most constraint.
+        """
+        if self.conflict:
+            return {Literal(symbol), Literal(symbol, negated=True)}
+        value = self.values.get(symbol)
+        if value is None and self.possible is not None and self.is_hazard(symbol) and symbol not in self.possible:
+            value = False
+        return set() if value is None else {Literal(symbol, negated=not value)}
+
+    @property
+    def decisive(self) -> bool:
+        """True if entailed() is exactly what the theory entails, for every symbol."""
+        return self.conflict or (self.complete and (self.bound is None or self.slack > 0))
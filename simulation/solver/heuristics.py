@@ -0,0 +1,101 @@
+class VSIDS:
+    """
+    Variable State Independent Decaying Sum branching order.
+    + Every variable has an activity, bumped when it takes part in a conflict.
+    + Older bumps fade: the bump amount grows by 1/decay after every conflict, which orders the
+      variables like multiplying every activity by decay, in O(1).
+    + Variables waiting to be decided sit in a binary max-heap on activity, indexed by variable
+      (positions[var]), so a bump and the next branch variable both cost O(log n).
+    Assigned variables leave the heap lazily (when they reach the top), the owner pushes them
+    back when backtracking unassigns them.
+    """
+
+    def __init__(self, num_vars: int = 0, decay: float = 0.95, initial: list[float] = None):
+        self.activity: list[float] = [0.0]
+        self.positions: list[int] = [-1] # var -> index in heap, -1 = not in the heap
+        self.heap: list[int] = []
+        self.increment = 1.0
+        self.decay_factor = decay
+        if initial is not None:
+            self.activity = [0.0] + list(initial[1:])
+            self.positions = [-1] * len(self.activity)
+            for var in range(1, len(self.activity)):
+                self.push(var)
+        self.ensure_vars(num_vars)
+
+    def ensure_vars(self, num_vars: int):
+        for var in range(len(self.activity), num_vars + 1):
+            self.activity.append(0.0)
+            self.positions.append(-1)
+            self.push(var)
+
+    def __contains__(self, var: int) -> bool:
+        return self.positions[var] >= 0
+
+    def push(self, var: int):
+        if self.positions[var] < 0:
+            self.positions[var] = len(self.heap)
+            self.heap.append(var)
+            self.sift_up(len(self.heap) - 1)
+
+    def pop(self) -> int:
+        heap = self.heap
+        top = heap[0]
+        last = heap.pop()
+        self.positions[top] = -1
+        if heap:
+            heap[0] = last
+            self.positions[last] = 0
+            self.sift_down(0)
+        return top
+
+    def next_unassigned(self, model: list[int]):
+        """Unassigned variable with the highest activity (removed from the heap), None if there is none."""
+        while self.heap:
+            var = self.pop()
+            if not model[var]:
+                return var
+        return None
+
+    def bump(self, var: int, amount: float = None):
+        self.activity[var] += self.increment if amount is None else amount
+        if self.activity[var] > 1e100:
+            # Rescale everything to avoid float overflow, the order does not change
+            self.activity = [a * 1e-100 for a in self.activity]
+            self.increment *= 1e-100
+        if self.positions[var] >= 0:
+            self.sift_up(self.positions[var])
+
+    def decay(self):
+        self.increment /= self.decay_factor
+
+    def sift_up(self, i: int):
+        heap, positions, activity = self.heap, self.positions, self.activity
+        var = heap[i]
+        while i > 0:
+            parent = (i - 1) >> 1
+            if activity[heap[parent]] >= activity[var]:
+                break
+            heap[i] = heap[parent]
+            positions[heap[i]] = i
+            i = parent
+        heap[i] = var
+        positions[var] = i
+
+    def sift_down(self, i: int):
+        heap, positions, activity = self.heap, self.positions, self.activity
+        var = heap[i]
+        size = len(heap)
+        while True:
+            child = 2 * i + 1
+            if child >= size:
+                break
+            if child + 1 < size and activity[heap[child + 1]] > activity[heap[child]]:
+                child += 1
+            if activity[heap[child]] <= activity[var]:
+                break
+            heap[i] = heap[child]
+            positions[heap[i]] = i
+            i = child
+        heap[i] = var
+        positions[var] = i
@@ -0,0 +1,129 @@
+import multiprocessing
+import weakref
+
+from ..components import Literal, Clause
+
+def serve(connection, backend, slicing: bool, preprocessing: bool):
+    """
+    Worker process loop. Keeps its own copy of every theory up to date and answers
+    entailment queries on it with its own InferenceEngine (one backbone pass per chunk).
+    Messages: ("load", name, clauses, at_most), ("update", name, added, removed, at_most),
+              ("ask", name, literals, consistent) -> list of answers, ("stop",).
+    consistent: True if the owner already checked the theory is satisfiable, the check is skipped.
+    """
+    from ..inference import InferenceEngine
+    from ..knowledge_base import Theory
+
+    engine = InferenceEngine(backend, slicing=slicing, preprocessing=preprocessing)
+    theories: dict[str, Theory] = {}
+
+    while True:
+        message = connection.recv()
+        if message[0] == "load":
+            _, name, clauses, at_most = message
+            theories[name] = Theory(name)
+            theories[name].update(clauses)
+            theories[name].set_at_most(at_most)
+        elif message[0] == "update":
+            _, name, added, removed, at_most = message
+            theories[name].difference_update(removed)
+            theories[name].update(added)
+            theories[name].set_at_most(at_most)
+        elif message[0] == "ask":
+            _, name, literals, consistent = message
+            if consistent:
+                engine.record_answer(theories[name], None, False) # KB ╞ ⊥ is known to be False
+            entailed = engine.backbone(theories[name], list(dict.fromkeys(literal.name for literal in literals)))
+            connection.send([literal in entailed for literal in literals])
+        else:
+            break
+    connection.close()
+
+def stop_workers(connections, processes):
+    """Asks every worker to stop, entries that are None (never started) are skipped."""
+    for connection in connections:
+        if connection is None:
+            continue
+        try:
+            connection.send(("stop",))
+            connection.close()
+        except (OSError, ValueError):
+            pass # The worker is already gone
+    for process in processes:
+        if process is not None:
+            process.join(timeout=1)
+            if process.is_alive():
+                process.terminate() # Still busy on a problem nobody waits for
+
+class WorkerPool:
+    """
+    Persistent worker processes answering independent entailment queries in parallel.
+    + A theory is shipped to every worker once, then only the clauses added and removed
+      since the version the workers hold; queries only carry literals.
+    + The symbols are split into one chunk per worker (both polarities of a symbol stay together),
+      the answers are gathered back in the order the literals were asked.
+    Workers are started on first use and stopped by close() or when the pool is garbage collected.
+    """
+
+    def __init__(self, workers: int, backend, slicing: bool = True, preprocessing: bool = True):
+        self.workers = workers
+        self.args = (backend, slicing, preprocessing)
+        self.connections = []
+        self.processes = []
+        self.shipped: dict[str, tuple] = {} # theory name -> (version, clauses) every worker holds
+        self.finalizer = None
+
+    def start(self):
+        if self.processes:
+            return
+        for _ in range(self.workers):
+            connection, child_connection = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=serve, args=(child_connection, *self.args), daemon=True)
+            process.start()
+            child_connection.close()
+            self.connections.append(connection)
+            self.processes.append(process)
+        self.finalizer = weakref.finalize(self, stop_workers, self.connections, self.processes)
+
+    def close(self):
+        if self.finalizer is not None:
+            self.finalizer()
+        self.connections, self.processes = [], []
+        self.shipped.clear()
+
+    def entails(self, KB, literals: list[Literal], consistent: bool = False) -> list[bool]:
+        """
+        KB ╞ α for every literal, in order. KB is a Theory (shipped once per version) or a set of clauses.
+        consistent: the caller knows KB is satisfiable, so the workers do not check it again.
+        """
+        self.start()
+
+        name = getattr(KB, "name", None)
+        version = getattr(KB, "version", None)
+        at_most = getattr(KB, "at_most", None)
+        shipped_version, shipped_clauses = self.shipped.get(name, (None, None))
+        if version is None or version != shipped_version:
+            clauses: frozenset[Clause] = frozenset(KB)
+            if shipped_clauses is None:
+                message = ("load", name, clauses, at_most)
+            else:
+                message = ("update", name, clauses - shipped_clauses, shipped_clauses - clauses, at_most)
+            for connection in self.connections:
+                connection.send(message)
+            self.shipped[name] = (version, clauses)
+
+        # One chunk of symbols per worker
+        symbols = list(dict.fromkeys(literal.name for literal in literals))
+        chunk_size = -(-len(symbols) // self.workers) # Ceiling division
+        chunks = [set(symbols[i:i + chunk_size]) for i in range(0, len(symbols), chunk_size)]
+
+        asked = []
+        for connection, chunk_symbols in zip(self.connections, chunks):
+            chunk = [literal for literal in literals if literal.name in chunk_symbols]
+            connection.send(("ask", name, chunk, consistent))
+            asked.append((connection, chunk))
+
+        answers: dict[Literal, bool] = {}
+        for connection, chunk in asked:
+            answers.update(zip(chunk, connection.recv()))
+        return [answers[literal] for literal in literals]
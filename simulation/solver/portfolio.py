@@ -0,0 +1,130 @@
+import multiprocessing
+import multiprocessing.connection
+import weakref
+from collections import Counter
+
+from ..components import Clause
+from .backends import SolverBackend, DPLLBackend, CDCLBackend, register_backend
+from .parallel import stop_workers
+from .budget import BudgetExceeded
+from .cardinality import AtMost
+
+def race_worker(connection, backend: SolverBackend):
+    """Worker process loop: solves every problem it receives with its own backend."""
+    while True:
+        message = connection.recv()
+        if message[0] == "stop":
+            break
+        request, clauses, at_most = message
+        connection.send(backend.model(clauses, at_most) if request == "model" else backend.satisfiable(clauses, at_most))
+    connection.close()
+
+@register_backend
+class PortfolioBackend(SolverBackend):
+    """
+    Races differently configured backends on the same problem, each in its own worker process,
+    and returns the first answer (the search time varies a lot with the branching heuristic).
+    + As soon as one member answers, the losers still searching are terminated and restarted,
+      so no abandoned search keeps a core busy; a loser that has finished only has its answer drained.
+      The same goes for every member when the budget runs out.
+    + Problems with fewer than min_clauses clauses are solved in-process by the first member,
+      racing them costs more than it saves. So is every problem inside a daemon process
+      (e.g. a WorkerPool worker), which is not allowed to start the members' processes.
+    + wins counts how many races each member answered first, see win_rates().
+    + Only the deadline of a budget applies to a race (decisions are made in other processes).
+    """
+
+    name = "portfolio"
+
+    def __init__(self, members: list[SolverBackend] = None, min_clauses: int = 64):
+        self.members = members if members is not None else [DPLLBackend("moms"), DPLLBackend("first"), DPLLBackend("vsids"), CDCLBackend()]
+        self.min_clauses = min_clauses
+        self.wins: Counter = Counter() # member label -> races won
+        self.processes: list = [None] * len(self.members)
+        self.connections: list = [None] * len(self.members)
+        self.finalizer = weakref.finalize(self, stop_workers, self.connections, self.processes)
+
+    @property
+    def supports_models(self) -> bool:
+        return any(member.supports_models for member in self.members)
+
+    def __getstate__(self):
+        # Workers stay with the process that started them, a copy starts its own
+        return {"members": self.members, "min_clauses": self.min_clauses}
+
+    def __setstate__(self, state):
+        self.__init__(state["members"], state["min_clauses"])
+
+    def satisfiable(self, clauses: set[Clause], at_most: AtMost = None) -> bool:
+        return self.race("satisfiable", clauses, at_most)
+
+    def model(self, clauses: set[Clause], at_most: AtMost = None) -> dict[str, bool] | None:
+        return self.race("model", clauses, at_most)
+
+    def win_rates(self) -> dict[str, float]:
+        """Share of the races each member won."""
+        races = sum(self.wins.values())
+        return {member.label: self.wins[member.label] / races if races else 0.0 for member in self.members}
+
+    def close(self):
+        self.finalizer()
+        self.processes[:] = [None] * len(self.members)
+        self.connections[:] = [None] * len(self.members)
+        self.finalizer = weakref.finalize(self, stop_workers, self.connections, self.processes)
+
+    def race(self, request: str, clauses: set[Clause], at_most: AtMost = None):
+        entrants = [i for i, member in enumerate(self.members) if request == "satisfiable" or member.supports_models]
+        if len(clauses) < self.min_clauses or multiprocessing.current_process().daemon:
+            member = self.members[entrants[0]]
+            member.budget = self.budget
+            try:
+                return member.model(clauses, at_most) if request == "model" else member.satisfiable(clauses, at_most)
+            finally:
+                member.budget = None
+
+        for i in entrants:
+            if self.processes[i] is None:
+                self.restart(i)
+            self.connections[i].send((request, clauses, at_most))
+
+        waiting = {self.connections[i]: i for i in entrants}
+        while waiting:
+            timeout = self.budget.remaining_time() if self.budget is not None else None
+            ready = multiprocessing.connection.wait(list(waiting), timeout)
+            if not ready:
+                self.cancel(waiting.values())
+                raise BudgetExceeded()
+            for connection in ready:
+                i = waiting.pop(connection)
+                try:
+                    answer = connection.recv()
+                except EOFError:
+                    self.restart(i) # The worker died, the others may still answer
+                    continue
+                self.cancel(waiting.values())
+                self.wins[self.members[i].label] += 1
+                return answer
+        raise RuntimeError("Every portfolio worker died before answering")
+
+    def cancel(self, workers):
+        """Stops the workers still on a problem nobody waits for: drains an answer already sent, restarts the others."""
+        for i in list(workers):
+            if self.connections[i].poll():
+                try:
+                    self.connections[i].recv()
+                    continue
+                except EOFError:
+                    pass
+            self.restart(i)
+
+    def restart(self, i: int):
+        if self.processes[i] is not None:
+            self.processes[i].terminate()
+            self.processes[i].join()
+            self.connections[i].close()
+        connection, child_connection = multiprocessing.Pipe()
+        process = multiprocessing.Process(target=race_worker, args=(child_connection, self.members[i]), daemon=True)
+        process.start()
+        child_connection.close()
+        self.processes[i] = process
+        self.connections[i] = connection
@@ -0,0 +1,140 @@
+from ..components import Literal, Clause
+
+class Preprocessor:
+    """
+    CNF simplification run on a query slice before it reaches the solver.
+    + Unit propagation: clauses satisfied by a unit fact are removed, false literals are stripped
+    + Subsumption elimination: C ⊆ D makes D redundant
+    + Self-subsuming resolution: (A ∨ l) and (A ∨ B ∨ ¬l) strengthen the second clause to (A ∨ B)
+    + Bounded variable elimination: a symbol that will not be asked about is resolved away
+      when that does not increase the number of clauses
+    The result is equisatisfiable with the input for every assignment of the protected symbols,
+    so entailment of a literal over protected symbols is unchanged.
+    """
+
+    def __init__(self, clauses, protected: set[str], max_resolvent_size: int = 12):
+        self.protected = protected
+        self.max_resolvent_size = max_resolvent_size
+        self.clauses: set[Clause] = set()
+        self.occurrences: dict[Literal, set[Clause]] = {}
+        self.units: dict[str, Literal] = {}
+        self.conflict = False
+        for clause in clauses:
+            self.add(clause)
+
+    def add(self, clause: Clause):
+        if clause in self.clauses or any(literal.negate() in clause for literal in clause):
+            return # Duplicate or tautology
+        if not clause:
+            self.conflict = True
+        self.clauses.add(clause)
+        for literal in clause:
+            self.occurrences.setdefault(literal, set()).add(clause)
+
+    def remove(self, clause: Clause):
+        self.clauses.discard(clause)
+        for literal in clause:
+            self.occurrences[literal].discard(clause)
+
+    def replace(self, old: Clause, new: Clause):
+        self.remove(old)
+        self.add(new)
+
+    def run(self) -> set[Clause]:
+        self.propagate_units()
+        if not self.conflict:
+            self.eliminate_subsumed()
+            self.propagate_units()
+        if not self.conflict:
+            self.eliminate_variables()
+            self.eliminate_subsumed()
+            self.propagate_units()
+        if self.conflict:
+            return {frozenset()}
+        return self.clauses
+
+    def propagate_units(self):
+        """Simplifies every clause with the unit clauses, until no new unit appears."""
+        queue = [next(iter(clause)) for clause in self.clauses if len(clause) == 1]
+        while queue and not self.conflict:
+            literal = queue.pop()
+            known = self.units.get(literal.name)
+            if known is not None:
+                if known != literal:
+                    self.conflict = True
+                continue
+            self.units[literal.name] = literal
+
+            for clause in list(self.occurrences.get(literal, ())):
+                if len(clause) > 1:
+                    self.remove(clause) # Satisfied, the unit clause itself stays
+
+            for clause in list(self.occurrences.get(literal.negate(), ())):
+                strengthened = clause - {literal.negate()}
+                self.replace(clause, strengthened)
+                if len(strengthened) == 1:
+                    queue.append(next(iter(strengthened)))
+
+    def eliminate_subsumed(self):
+        """Subsumption elimination followed by self-subsuming resolution, to a fixpoint."""
+        changed = True
+        while changed and not self.conflict:
+            changed = False
+            for clause in sorted(self.clauses, key=len):
+                if clause not in self.clauses:
+                    continue
+
+                # Clauses containing every literal of this one are redundant
+                rarest = min(clause, key=lambda literal: len(self.occurrences.get(literal, ())))
+                for other in list(self.occurrences.get(rarest, ())):
+                    if other is not clause and len(other) > len(clause) and clause <= other:
+                        self.remove(other)
+                        changed = True
+
+                # (A ∨ l) resolves ¬l out of every clause (A ∨ B ∨ ¬l)
+                for literal in clause:
+                    rest = clause - {literal}
+                    for other in list(self.occurrences.get(literal.negate(), ())):
+                        if len(other) >= len(clause) and rest <= other:
+                            self.replace(other, other - {literal.negate()})
+                            changed = True
+                    if clause not in self.clauses:
+                        break
+
+    def eliminate_variables(self):
+        """Bounded variable elimination of the unprotected symbols, cheapest first."""
+        candidates = {literal.name for clause in self.clauses for literal in clause} - self.protected
+        for name in sorted(candidates, key=self.elimination_cost):
+            if self.conflict:
+                return
+            positive = list(self.occurrences.get(Literal(name), ()))
+            negative = list(self.occurrences.get(Literal(name, negated=True), ()))
+
+            resolvents = set()
+            bounded = True
+            for p in positive:
+                for n in negative:
+                    resolvent = (p - {Literal(name)}) | (n - {Literal(name, negated=True)})
+                    if any(literal.negate() in resolvent for literal in resolvent):
+                        continue # Tautology
+                    if len(resolvent) > self.max_resolvent_size:
+                        bounded = False
+                        break
+                    resolvents.add(resolvent)
+                if not bounded or len(resolvents) > len(positive) + len(negative):
+                    bounded = False
+                    break
+
+            if not bounded:
+                continue
+            for clause in positive + negative:
+                self.remove(clause)
+            for resolvent in resolvents:
+                self.add(resolvent)
+
+    def elimination_cost(self, name: str) -> int:
+        return len(self.occurrences.get(Literal(name), ())) * len(self.occurrences.get(Literal(name, negated=True), ()))
+
+def preprocess(clauses, protected: set[str]) -> set[Clause]:
+    """Simplified, equisatisfiable copy of the clauses that keeps every protected symbol."""
+    return Preprocessor(clauses, protected).run()
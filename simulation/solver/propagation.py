@@ -0,0 +1,327 @@
+from .encoding import IntClause
+
+class Propagator:
+    """
+    Unit propagation engine based on two watched literals.
+    + Every clause of length >= 2 watches its first two literals, so assigning a
+      variable only visits the clauses that watch its negation.
+    + Occurrence lists (literal -> clause indices) are kept for heuristics that
+      need to see every clause containing a literal (pure symbols).
+    + Assignments are recorded on a trail split into decision levels, so
+      backtracking undoes them in place.
+    + At-most-k constraints (see add_at_most) are propagated natively by counting their
+      True members: once k are True the others are forced False, a (k+1)-th is a conflict.
+    """
+
+    def __init__(self, num_vars: int = 0):
+        self.model: list[int] = [0] * (num_vars + 1) # 1 = True, -1 = False, 0 = unassigned
+        self.levels: list[int] = [0] * (num_vars + 1) # decision level of each assigned variable
+        self.reasons: list[int] = [-1] * (num_vars + 1) # clause that forced each variable, -1 = decision / fact, -2 = at-most constraint
+        self.clauses: list[list[int]] = []
+        self.watches: dict[int, list[int]] = {}     # literal -> indices of clauses watching it
+        self.occurrences: dict[int, list[int]] = {} # literal -> indices of clauses containing it
+
+        self.trail: list[int] = []                  # assigned literals in assignment order
+        self.trail_lim: list[int] = []              # trail length at the start of each decision level
+        self.queue_head = 0                         # next trail position to propagate
+        self.inconsistent = False                   # an empty clause or a conflicting unit was added
+
+        # At-most-k constraints
+        self.at_most_members: list[list[int]] = []  # constraint -> member variables
+        self.at_most_bounds: list[int] = []         # constraint -> k
+        self.at_most_true: list[list[int]] = []     # constraint -> members counted True, in trail order
+        self.member_of: dict[int, int] = {}         # variable -> its constraint
+        self.explanations: dict[int, list[int]] = {} # variable forced False by a constraint -> reason clause
+        self.counted = 0                            # trail positions already counted
+        self.at_most_conflict: int = None           # clause slot reused for every violated constraint
+
+        # Search counters (cumulative, read by solver statistics)
+        self.decisions = 0
+        self.propagations = 0
+        self.conflicts = 0
+        self.backtracks = 0
+        self.max_depth = 0                          # deepest decision level reached
+
+    @property
+    def num_vars(self) -> int:
+        return len(self.model) - 1
+
+    @property
+    def decision_level(self) -> int:
+        return len(self.trail_lim)
+
+    def ensure_vars(self, num_vars: int):
+        if num_vars > self.num_vars:
+            extra = num_vars - self.num_vars
+            self.model.extend([0] * extra)
+            self.levels.extend([0] * extra)
+            self.reasons.extend([-1] * extra)
+
+    def value(self, lit: int) -> int:
+        """1 if the literal is true, -1 if false, 0 if unassigned."""
+        return self.model[lit] if lit > 0 else -self.model[-lit]
+
+    def add_clause(self, clause: IntClause) -> bool:
+        """
+        Adds a clause at decision level 0.
+        Literals already false at level 0 are dropped, so the watch invariant
+        holds even if the clause arrives after propagation.
+        Returns False if the clause set is now trivially unsatisfiable.
+        """
+        literals = list(dict.fromkeys(clause)) # Drop duplicate literals, keep order
+        if any(-lit in literals for lit in literals):
+            return not self.inconsistent # Tautology, never constrains anything
+
+        self.ensure_vars(max((abs(lit) for lit in literals), default=0))
+
+        values = [self.value(lit) for lit in literals]
+        if 1 in values:
+            return not self.inconsistent # Already satisfied at level 0
+        literals = [lit for lit, value in zip(literals, values) if value == 0]
+
+        if not literals:
+            self.inconsistent = True
+            return False
+
+        if len(literals) == 1:
+            self.assign(literals[0])
+            return not self.inconsistent
+
+        index = len(self.clauses)
+        self.clauses.append(literals)
+        self.watches.setdefault(literals[0], []).append(index)
+        self.watches.setdefault(literals[1], []).append(index)
+        for lit in literals:
+            self.occurrences.setdefault(lit, []).append(index)
+        return not self.inconsistent
+
+    def add_clauses(self, clauses) -> bool:
+        for clause in clauses:
+            self.add_clause(clause)
+        return not self.inconsistent
+
+    def add_learned_clause(self, literals: list[int]) -> int:
+        """
+        Adds a clause derived during search and returns its index.
+        literals[0] must be the only unassigned literal and literals[1] the false
+        literal with the highest decision level, so both watches stay valid after backjumping.
+        """
+        index = len(self.clauses)
+        self.clauses.append(literals)
+        self.watches.setdefault(literals[0], []).append(index)
+        self.watches.setdefault(literals[1], []).append(index)
+        return index
+
+    def add_at_most(self, variables: list[int], bound: int) -> int:
+        """
+        Adds "at most `bound` of the variables are True" at decision level 0, returns its index.
+        A variable belongs to one constraint at most.
+        """
+        index = len(self.at_most_bounds)
+        self.at_most_members.append([])
+        self.at_most_bounds.append(bound)
+        self.at_most_true.append([])
+        self.extend_at_most(index, variables)
+        return index
+
+    def extend_at_most(self, index: int, variables: list[int] = (), bound: int = None):
+        """
+        Adds members to a constraint and/or lowers its bound, at decision level 0.
+        Raising the bound is not supported (what was derived from the old one would not hold anymore).
+        """
+        self.ensure_vars(max(variables, default=0))
+        if not self.member_of:
+            self.counted = self.queue_head
+        members = self.at_most_members[index]
+        true = self.at_most_true[index]
+        for var in variables:
+            if var in self.member_of:
+                continue
+            self.member_of[var] = index
+            members.append(var)
+            if self.model[var] > 0 and self.trail.index(var) < self.queue_head:
+                true.append(var) # Already past the propagation queue (at level 0, never undone), count it now
+        if bound is not None:
+            self.at_most_bounds[index] = min(bound, self.at_most_bounds[index])
+
+        if len(true) > self.at_most_bounds[index]:
+            self.inconsistent = True
+        elif len(true) == self.at_most_bounds[index]:
+            self.force_at_most(index)
+
+    def force_at_most(self, index: int):
+        """Assigns False to the unassigned members of a constraint whose bound is reached."""
+        model = self.model
+        explanation = [-var for var in self.at_most_true[index]]
+        for var in self.at_most_members[index]:
+            if not model[var]:
+                self.explanations[var] = [-var, *explanation]
+                self.assign(-var, -2)
+                self.propagations += 1
+
+    def reason(self, var: int) -> list[int]:
+        """The clause that forced an implied variable (made up from its constraint for an at-most one)."""
+        index = self.reasons[var]
+        return self.explanations[var] if index == -2 else self.clauses[index]
+
+    def assign(self, lit: int, reason: int = -1):
+        """Makes a literal true and queues it for propagation."""
+        var = abs(lit)
+        self.model[var] = 1 if lit > 0 else -1
+        self.levels[var] = len(self.trail_lim)
+        self.reasons[var] = reason
+        self.trail.append(lit)
+
+    def new_decision_level(self):
+        self.trail_lim.append(len(self.trail))
+
+    def decide(self, lit: int):
+        """Opens a new decision level and assigns a branching literal."""
+        self.new_decision_level()
+        self.assign(lit)
+        self.decisions += 1
+        if len(self.trail_lim) > self.max_depth:
+            self.max_depth = len(self.trail_lim)
+
+    def backtrack(self, level: int):
+        """Undoes every assignment made above the given decision level."""
+        if self.decision_level <= level:
+            return
+        model = self.model
+        trail = self.trail
+        start = self.trail_lim[level]
+        for lit in trail[start:]:
+            model[abs(lit)] = 0
+        if self.counted > start:
+            member_of = self.member_of
+            for lit in reversed(trail[start:self.counted]):
+                if lit > 0 and lit in member_of:
+                    self.at_most_true[member_of[lit]].pop()
+            self.counted = start
+        del trail[start:]
+        del self.trail_lim[level:]
+        self.queue_head = start
+        self.backtracks += 1
+
+    def propagate(self):
+        """
+        Propagates every queued assignment.
+        Returns the index of a falsified clause on conflict, otherwise None.
+        """
+        if self.inconsistent:
+            return -1
+
+        model = self.model
+        trail = self.trail
+        clauses = self.clauses
+        watches = self.watches
+        member_of = self.member_of
+
+        while self.queue_head < len(trail):
+            false_lit = -trail[self.queue_head]
+            self.queue_head += 1
+
+            if member_of:
+                self.counted = self.queue_head
+                if false_lit < 0 and -false_lit in member_of:
+                    conflict = self.count_true(member_of[-false_lit], -false_lit)
+                    if conflict is not None:
+                        self.queue_head = len(trail)
+                        self.conflicts += 1
+                        return conflict
+
+            watchers = watches.get(false_lit)
+            if not watchers:
+                continue
+
+            kept = 0
+            i = 0
+            count = len(watchers)
+            while i < count:
+                index = watchers[i]
+                i += 1
+                clause = clauses[index]
+
+                # Keep the falsified watch in slot 1
+                if clause[0] == false_lit:
+                    clause[0], clause[1] = clause[1], false_lit
+                other = clause[0]
+                other_value = model[other] if other > 0 else -model[-other]
+                if other_value > 0:
+                    watchers[kept] = index # Clause already satisfied, keep watching
+                    kept += 1
+                    continue
+
+                # Look for a replacement watch that is not false
+                for k in range(2, len(clause)):
+                    lit = clause[k]
+                    if (model[lit] if lit > 0 else -model[-lit]) >= 0:
+                        clause[1], clause[k] = lit, false_lit
+                        watches.setdefault(lit, []).append(index)
+                        break
+                else:
+                    watchers[kept] = index
+                    kept += 1
+                    if other_value < 0:
+                        # Conflict: keep the remaining watchers and stop
+                        while i < count:
+                            watchers[kept] = watchers[i]
+                            kept += 1
+                            i += 1
+                        del watchers[kept:]
+                        self.queue_head = len(trail)
+                        self.conflicts += 1
+                        return index
+                    self.assign(other, index) # Unit clause
+                    self.propagations += 1
+
+            del watchers[kept:]
+
+        return None
+
+    def count_true(self, index: int, var: int):
+        """
+        Counts a member of an at-most constraint that became True.
+        Returns the index of a clause made up from the constraint if it is violated, otherwise None.
+        """
+        true = self.at_most_true[index]
+        true.append(var)
+        bound = self.at_most_bounds[index]
+        if len(true) > bound:
+            # Conflict clause (¬t1 ∨ ... ∨ ¬tk+1), only read by the analysis of this conflict: one unwatched
+            # slot is overwritten every time, the constraint itself does the propagation
+            conflict = [-member for member in true[-bound - 1:]]
+            if self.at_most_conflict is None:
+                self.at_most_conflict = len(self.clauses)
+                self.clauses.append(conflict)
+            else:
+                self.clauses[self.at_most_conflict] = conflict
+            return self.at_most_conflict
+        if len(true) == bound:
+            self.force_at_most(index)
+        return None
+
+    def counters(self) -> dict[str, int]:
+        """Search counters so far (see SolverStats.count_search)."""
+        return {"decisions": self.decisions, "propagations": self.propagations, "conflicts": self.conflicts,
+                "backtracks": self.backtracks, "max_depth": self.max_depth}
+
+    def is_satisfied(self, index: int) -> bool:
+        model = self.model
+        return any((model[lit] if lit > 0 else -model[-lit]) > 0 for lit in self.clauses[index])
+
+    def pure_literals(self) -> list[int]:
+        """
+        Finds unassigned variables that appear with one polarity only among the
+        clauses that are not yet satisfied, using the occurrence lists.
+        Members of an at-most constraint are only pure when negative (True could break the bound).
+        """
+        pure = []
+        for var in range(1, self.num_vars + 1):
+            if self.model[var]:
+                continue
+            positive = any(not self.is_satisfied(index) for index in self.occurrences.get(var, ()))
+            negative = any(not self.is_satisfied(index) for index in self.occurrences.get(-var, ()))
+            if positive != negative and not (positive and var in self.member_of):
+                pure.append(var if positive else -var)
+        return pure
@@ -0,0 +1,129 @@
+from .encoding import SymbolTable
+from .vectorized import np, require_numpy
+
+class GibbsSampler:
+    """
+    Approximate P(symbol | clauses) by Gibbs sampling, for frontiers too long for exact counting
+    (solver.ModelCounter). Same model: hazard symbols (names starting with `prefix`) are True with
+    probability `prior`, every other symbol weighs 1 for both values.
+    + Many chains run side by side as NumPy arrays: the assignments (chains × variables) and the
+      number of true literals of every clause in every chain (chains × clauses)
+    + A value that would leave a clause with no true literal has probability 0, otherwise the weights decide
+    + Variables are colored so that no two of a color share a clause: given the others, those are
+      independent, so one sweep resamples a whole color at once in every chain (chromatic Gibbs)
+    + A unit clause keeps its variable at the value it sets
+    It stops after `samples` samples (chains × sweeps) or once the standard error of every marginal,
+    estimated from the spread of the per-chain averages, is below `tolerance` (checked every `min_sweeps` sweeps).
+    Non-hazard symbols are best eliminated beforehand (see InferenceEngine.sample_probabilities):
+    a percept is a function of the hazards around it, and resampling it alone would stall the chains.
+    """
+
+    def __init__(self, clauses, prefix: str, prior: float, chains: int = 64, seed: int = None):
+        require_numpy()
+        self.prefix = prefix
+        self.prior = prior
+        self.chains = chains
+        self.rng = np.random.default_rng(seed)
+
+        self.table = SymbolTable()
+        encoded = [self.table.encode_clause(clause) for clause in clauses]
+        self.clauses = [clause for clause in encoded if not any(-lit in clause for lit in clause)] # Tautologies constrain nothing
+
+        num_vars = len(self.table)
+        self.names = self.table.names[1:] # Column j holds variable j + 1
+        self.weights = np.array([prior if name.startswith(prefix) else 0.5 for name in self.names]) # P(True) before the clauses
+        occurrences: list[list[tuple[int, int]]] = [[] for _ in range(num_vars)] # column -> (clause, sign)
+        for index, clause in enumerate(self.clauses):
+            for lit in clause:
+                occurrences[abs(lit) - 1].append((index, 1 if lit > 0 else -1))
+        self.colors = [self.color_class(columns, occurrences) for columns in self.color(occurrences)]
+        self.sweeps = 0
+
+    def color(self, occurrences: list[list[tuple[int, int]]]) -> list[list[int]]:
+        """Greedy coloring of the variables (most constrained first), two variables of a clause never share a color."""
+        colors: list[int] = [-1] * len(occurrences)
+        classes: list[list[int]] = []
+        for column in sorted(range(len(occurrences)), key=lambda column: -len(occurrences[column])):
+            taken = {colors[abs(lit) - 1] for index, _ in occurrences[column] for lit in self.clauses[index]}
+            color = next(color for color in range(len(classes) + 1) if color not in taken)
+            if color == len(classes):
+                classes.append([])
+            classes[color].append(column)
+            colors[column] = color
+        return classes
+
+    def color_class(self, columns: list[int], occurrences: list[list[tuple[int, int]]]) -> tuple:
+        """
+        Arrays of one color: its columns, and its literals grouped by variable (clause, position of
+        the variable in the color, sign) with the start of every group. A clause holds at most one of them.
+        """
+        clauses, positions, signs, starts = [], [], [], [0]
+        for position, column in enumerate(columns):
+            for index, sign in occurrences[column]:
+                clauses.append(index)
+                positions.append(position)
+                signs.append(sign)
+            starts.append(len(clauses))
+        return (np.array(columns, dtype=np.int64), np.array(clauses, dtype=np.int64), np.array(positions, dtype=np.int64),
+                np.array(signs, dtype=np.int32), np.array(starts, dtype=np.int64))
+
+    def run(self, model: dict[str, bool], samples: int = 20_000, tolerance: float = None,
+            burn_in: int = 50, min_sweeps: int = 20) -> dict[str, float]:
+        """
+        Marginal P(True) of every symbol of the clauses, every chain starting from `model`
+        (a model of the clauses, symbols it leaves out are False).
+        """
+        start = np.array([model.get(name, False) for name in self.names], dtype=np.int8)
+        state = np.tile(start, (self.chains, 1))
+        counts = self.true_counts(state)
+        if counts.size and not (counts > 0).all():
+            raise ValueError("The start model does not satisfy the clauses")
+
+        for _ in range(burn_in):
+            self.sweep(state, counts)
+
+        totals = np.zeros(state.shape, dtype=np.float64) # Per chain and variable, True samples so far
+        self.sweeps = 0
+        while True:
+            self.sweep(state, counts)
+            totals += state
+            self.sweeps += 1
+            if self.sweeps * self.chains >= samples:
+                break
+            if tolerance is not None and self.sweeps % min_sweeps == 0 and self.error(totals) <= tolerance:
+                break
+
+        return dict(zip(self.names, (totals.sum(axis=0) / (self.sweeps * self.chains)).tolist()))
+
+    def true_counts(self, state) -> "np.ndarray":
+        """Number of true literals of every clause in every chain."""
+        counts = np.zeros((self.chains, len(self.clauses)), dtype=np.int32)
+        for index, clause in enumerate(self.clauses):
+            for lit in clause:
+                column = state[:, abs(lit) - 1]
+                counts[:, index] += column if lit > 0 else 1 - column
+        return counts
+
+    def sweep(self, state, counts):
+        """Resamples every variable once in every chain, one color at a time, keeping counts up to date."""
+        rng = self.rng
+        for color in rng.permutation(len(self.colors)):
+            columns, clauses, positions, signs, starts = self.colors[color]
+            current = state[:, columns]
+            values = current[:, positions]
+            # Flipping a variable breaks a clause whose only true literal is the variable's
+            breaking = np.where(signs > 0, values, 1 - values).astype(bool) & (counts[:, clauses] == 1)
+            breaking = np.concatenate((np.zeros((self.chains, 1), dtype=np.int64), np.cumsum(breaking, axis=1)), axis=1)
+            stuck = breaking[:, starts[1:]] > breaking[:, starts[:-1]]
+            drawn = rng.random((self.chains, len(columns))) < self.weights[columns]
+            new = np.where(stuck, current, drawn).astype(np.int8)
+            delta = new.astype(np.int32) - current
+            counts[:, clauses] += delta[:, positions] * signs
+            state[:, columns] = new
+
+    def error(self, totals) -> float:
+        """Largest standard error over the marginals, from the spread of the per-chain averages."""
+        if self.chains < 2 or not totals.size:
+            return 0.0
+        means = totals / self.sweeps
+        return float((means.std(axis=0, ddof=1) / np.sqrt(self.chains)).max())
@@ -0,0 +1,142 @@
+from ..components import Literal, Clause
+from .encoding import SymbolTable
+from .cdcl import CDCLSolver
+from .stats import SolverStats
+from .budget import Budget
+from .cardinality import AtMost
+
+class SolverSession:
+    """
+    Long-lived CDCL solver attached to one theory of the KB.
+    + Rules (clauses with 2+ literals) are pushed into the solver once and never removed.
+    + Facts (unit clauses) are kept aside and passed as assumptions with every query,
+      because the KB retracts them (stench facts, wumpus facts, percept updates).
+    + An at-most constraint (set_at_most) lives in the solver, every new symbol it covers joins it.
+    Learned clauses and variable activities carry over from one query to the next.
+    """
+
+    def __init__(self):
+        self.table = SymbolTable()
+        self.solver = CDCLSolver()
+        self.facts: dict[Literal, int] = {} # fact -> encoded literal, in the order they were told
+        self.last_slice = (None, None, None)  # (slice, its encoded facts, its variables), reused by repeated queries
+        self.rules = 0
+        self.stats: SolverStats = None # while set (by InferenceEngine), every query adds its counters to it
+        self.budget: Budget = None # while set, every query is charged to it (see CDCLSolver.solve)
+        self.at_most: AtMost = None
+        self.at_most_index: int = None # the constraint inside the solver
+        self.at_most_synced = 0 # symbols of the table already checked for membership
+        self.core: frozenset[Clause] = None # facts the last unsatisfiable query was refuted with
+
+    def add_clause(self, clause: Clause):
+        if len(clause) == 1:
+            fact = next(iter(clause))
+            self.facts[fact] = self.table.encode_literal(fact)
+        else:
+            self.solver.add_clause(self.table.encode_clause(clause))
+            self.rules += 1
+
+    def remove_clause(self, clause: Clause) -> bool:
+        """
+        Retracts a fact. Returns False for a rule, which the solver cannot forget;
+        the owner then has to start a new session.
+        """
+        if len(clause) != 1:
+            return False
+        self.facts.pop(next(iter(clause)), None)
+        return True
+
+    def set_at_most(self, at_most: AtMost) -> bool:
+        """
+        Sets the at-most constraint of the theory. Returns False if the solver cannot take it
+        (no constraint anymore, another prefix or a higher bound): what it derived from the old
+        constraint would not hold, the owner then has to start a new session.
+        """
+        if self.at_most is not None and (at_most is None or at_most.prefix != self.at_most.prefix or at_most.bound > self.at_most.bound):
+            return False
+        if at_most is None:
+            return True
+        if self.at_most_index is None:
+            self.at_most_index = self.solver.add_at_most([], at_most.bound)
+        else:
+            self.solver.extend_at_most(self.at_most_index, bound=at_most.bound)
+        self.at_most = at_most
+        self.sync_at_most()
+        return True
+
+    def sync_at_most(self):
+        """Adds the symbols allocated since the last call that the at-most constraint covers to it."""
+        if self.at_most is None or self.at_most_synced == len(self.table):
+            return
+        names = self.table.names
+        members = [var for var in range(self.at_most_synced + 1, len(names)) if self.at_most.covers(names[var])]
+        self.at_most_synced = len(self.table)
+        if members:
+            self.solver.extend_at_most(self.at_most_index, members)
+
+    def satisfiable(self, assumptions: list[Literal] = (), within: frozenset[Clause] = None) -> bool:
+        """
+        Checks if the theory is satisfiable together with the given literals.
+        within: optional slice of the theory, only its facts are assumed and only its
+        symbols are branched on (see Theory.slice).
+        When it is not, core holds the facts the refutation needed (with the rules, they are
+        unsatisfiable together with the literals), None otherwise.
+        """
+        if within is None:
+            encoded = list(self.facts.values())
+            decision_vars = None
+        else:
+            encoded, decision_vars = self.encode_slice(within)
+            encoded = list(encoded)
+
+        encoded.extend(self.table.encode_literal(literal) for literal in assumptions)
+        if decision_vars is not None:
+            decision_vars = decision_vars + [abs(lit) for lit in encoded[len(encoded) - len(assumptions):]]
+
+        self.solver.ensure_vars(len(self.table))
+        self.sync_at_most()
+        self.core = None
+        if self.stats is None:
+            result = self.solver.solve(encoded, decision_vars, self.budget)
+            if not result:
+                self.core = self.failed_facts()
+            return result
+
+        propagator = self.solver.propagator
+        before = propagator.counters()
+        propagator.max_depth = 0
+        result = self.solver.solve(encoded, decision_vars, self.budget)
+        after = propagator.counters()
+        self.stats.count_call(len(within) if within is not None else self.rules + len(encoded), len(decision_vars) if decision_vars is not None else len(self.table))
+        self.stats.count_search(**{name: after[name] - before[name] for name in before if name != "max_depth"}, max_depth=after["max_depth"])
+        if not result:
+            self.core = self.failed_facts()
+        return result
+
+    def failed_facts(self) -> frozenset[Clause]:
+        """The facts among the assumptions of the solver's last core (the query literals are not facts)."""
+        decoded = (self.table.decode_literal(lit) for lit in self.solver.core)
+        return frozenset(frozenset([literal]) for literal in decoded if literal in self.facts)
+
+    def encode_slice(self, within: frozenset[Clause]) -> tuple[list[int], list[int]]:
+        """Encoded facts and variables of a slice, remembered for the queries that follow on the same slice."""
+        if self.last_slice[0] is not within:
+            facts = [self.facts[literal] for clause in within if len(clause) == 1 for literal in clause]
+            variables = list({self.table.variable(literal.name) for clause in within for literal in clause})
+            self.last_slice = (within, facts, variables)
+        return self.last_slice[1], self.last_slice[2]
+
+    def find_model(self, assumptions: list[Literal] = (), within: frozenset[Clause] = None) -> dict[str, bool] | None:
+        """A model of the theory together with the given literals, None if there is none."""
+        if not self.satisfiable(assumptions, within):
+            return None
+        return self.model()
+
+    def model(self) -> dict[str, bool]:
+        """The model the last satisfiable query found (only the slice is meaningful if it was given one)."""
+        model = self.table.decode_model(self.solver.propagator.model)
+        return self.at_most.complete(model, self.table.names[1:]) if self.at_most is not None else model
+
+    def entails(self, alpha: Literal, within: frozenset[Clause] = None) -> bool:
+        """KB ╞ α iff (KB ∧ ¬α) is unsatisfiable, ¬α is only an assumption."""
+        return not self.satisfiable([alpha.negate()], within)
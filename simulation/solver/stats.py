@@ -0,0 +1,47 @@
+from dataclasses import dataclass, fields
+
+@dataclass
+class SolverStats:
+    """
+    Counters of the solver work behind one engine query, or summed over many (see InferenceEngine.stats).
+    clauses / variables: size of every clause set handed to a solver (summed over its solver calls).
+    Backends that do not count their search (reference, portfolio, worker processes) leave
+    decisions ... max_depth at 0.
+    """
+
+    queries: int = 0
+    solver_calls: int = 0
+    clauses: int = 0
+    variables: int = 0
+    decisions: int = 0
+    propagations: int = 0
+    pure_literals: int = 0
+    conflicts: int = 0
+    backtracks: int = 0
+    max_depth: int = 0
+    time: float = 0.0
+
+    def add(self, other: "SolverStats"):
+        """Adds the counters of another run (the deepest search wins max_depth)."""
+        for field in fields(self):
+            if field.name == "max_depth":
+                self.max_depth = max(self.max_depth, other.max_depth)
+            else:
+                setattr(self, field.name, getattr(self, field.name) + getattr(other, field.name))
+
+    def count_call(self, clauses: int, variables: int):
+        self.solver_calls += 1
+        self.clauses += clauses
+        self.variables += variables
+
+    def count_search(self, decisions: int = 0, propagations: int = 0, pure_literals: int = 0, conflicts: int = 0,
+                     backtracks: int = 0, max_depth: int = 0):
+        self.decisions += decisions
+        self.propagations += propagations
+        self.pure_literals += pure_literals
+        self.conflicts += conflicts
+        self.backtracks += backtracks
+        self.max_depth = max(self.max_depth, max_depth)
+
+    def as_dict(self) -> dict:
+        return {field.name: getattr(self, field.name) for field in fields(self)}
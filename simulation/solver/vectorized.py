@@ -0,0 +1,188 @@
+from itertools import chain
+
+try:
+    import numpy as np
+except ImportError: # Optional dependency, only needed by this module
+    np = None
+
+from ..components import Clause
+from .encoding import IntClause, compile_clauses
+from .backends import SolverBackend, register_backend
+from .cardinality import AtMost
+
+def require_numpy():
+    if np is None:
+        raise ImportError("The vectorized solver needs NumPy (pip install numpy)")
+
+class SignMatrix:
+    """
+    Clause × variable sign matrix of a clause set (+1 positive literal, -1 negative, 0 absent),
+    stored sparse: one entry per literal, grouped by clause (CSR order).
+    The status of every clause against an assignment vector (1 True, -1 False, 0 unassigned,
+    indexed by variable) is computed in one vectorized step, for one assignment or for a
+    whole batch of them (one per row).
+    """
+
+    def __init__(self, clauses: list[IntClause], num_vars: int):
+        require_numpy()
+        self.num_vars = num_vars
+        self.num_clauses = len(clauses)
+        lengths = np.fromiter((len(clause) for clause in clauses), dtype=np.int64, count=len(clauses))
+        self.has_empty_clause = bool((lengths == 0).any())
+
+        flat = np.fromiter(chain.from_iterable(clauses), dtype=np.int64, count=int(lengths.sum()))
+        self.literals = flat
+        self.variables = np.abs(flat)
+        self.signs = np.sign(flat).astype(np.int8)
+        self.starts = np.concatenate(([0], np.cumsum(lengths)[:-1])).astype(np.int64)
+        self.clause_of = np.repeat(np.arange(len(clauses)), lengths) # literal -> its clause
+
+    def literal_values(self, assignment):
+        """Value of every literal (1 True, -1 False, 0 unassigned), for a vector or a batch of rows."""
+        return self.signs * assignment[..., self.variables]
+
+    def clause_counts(self, values):
+        """(clause satisfied?, number of unassigned literals) of every clause."""
+        satisfied = np.add.reduceat((values > 0).astype(np.int32), self.starts, axis=-1) > 0
+        free = np.add.reduceat((values == 0).astype(np.int32), self.starts, axis=-1)
+        return satisfied, free
+
+    def evaluate_many(self, assignments):
+        """
+        Status of the clause set under every row of a (k × num_vars+1) assignment matrix:
+        1 if every clause is satisfied, -1 if some clause is falsified, 0 otherwise.
+        """
+        assignments = np.asarray(assignments, dtype=np.int8)
+        if self.has_empty_clause:
+            return np.full(len(assignments), -1, dtype=np.int8)
+        if self.num_clauses == 0:
+            return np.ones(len(assignments), dtype=np.int8)
+        satisfied, free = self.clause_counts(self.literal_values(assignments))
+        status = np.zeros(len(assignments), dtype=np.int8)
+        status[satisfied.all(axis=1)] = 1
+        status[(~satisfied & (free == 0)).any(axis=1)] = -1
+        return status
+
+class NumpyBackend(SolverBackend):
+    """
+    DPLL whose clause checks run on a NumPy sign matrix (see SignMatrix), for very large clause sets.
+    + Every search node evaluates all clauses in one vectorized step (satisfied / falsified / unit)
+    + All unit clauses found in a step are assigned at once
+    + MOMS branching from a bincount over the shortest unresolved clauses
+    + An at-most-k constraint is counted over the index array of its members
+    The per-node cost does not depend on Python loops over clauses, but every node pays
+    the NumPy call overhead: small clause sets are faster with the other backends.
+    """
+
+    name = "numpy"
+
+    def __init__(self):
+        require_numpy()
+        self.propagations = 0 # unit literals assigned by the current run
+
+    def model(self, clauses: set[Clause], at_most: AtMost = None) -> dict[str, bool] | None:
+        int_clauses, table = compile_clauses(clauses)
+        matrix = SignMatrix(int_clauses, len(table))
+        if matrix.has_empty_clause:
+            return None
+        members = np.array(at_most.variables(table) if at_most is not None else [], dtype=np.int64)
+        bound = at_most.bound if at_most is not None else 0
+
+        assignment = np.zeros(len(table) + 1, dtype=np.int8)
+        pending: list[tuple] = [] # (assignment before the decision, decided variable) whose False branch is left
+        decisions = backtracks = max_depth = 0
+        self.propagations = 0
+
+        try:
+            while True:
+                counts = self.propagate(matrix, assignment, members, bound) if matrix.num_clauses else None
+                if counts is False:
+                    if not pending:
+                        return None
+                    assignment, var = pending.pop()
+                    assignment[var] = -1
+                    decisions += 1
+                    backtracks += 1
+                    continue
+
+                var = self.select_variable(matrix, assignment, counts) if counts is not None else None
+                if var is None:
+                    assignment[members[assignment[members] == 0]] = -1 # Free members are False
+                    return table.decode_model(assignment.tolist()) # All clauses are satisfied
+
+                if self.budget is not None:
+                    self.budget.spend()
+                pending.append((assignment.copy(), var))
+                assignment[var] = 1
+                decisions += 1
+                max_depth = max(max_depth, len(pending))
+        finally:
+            if self.stats is not None:
+                self.stats.count_call(len(int_clauses), len(table))
+                self.stats.count_search(decisions=decisions, propagations=self.propagations, backtracks=backtracks, max_depth=max_depth)
+
+    def propagate(self, matrix: SignMatrix, assignment, members=None, bound: int = 0):
+        """
+        Assigns unit clauses until there are none, in place.
+        members / bound: at most `bound` of the variables of the index array `members` are True,
+        once `bound` are the others are assigned False.
+        Returns False on conflict, otherwise (satisfied, free counts, literal values) of the final state.
+        """
+        while True:
+            if members is not None and members.size:
+                member_values = assignment[members]
+                count = int((member_values > 0).sum())
+                if count > bound:
+                    return False
+                if count == bound:
+                    forced = members[member_values == 0]
+                    assignment[forced] = -1
+                    self.propagations += len(forced)
+
+            values = matrix.literal_values(assignment)
+            satisfied, free = matrix.clause_counts(values)
+            open_clauses = ~satisfied
+            if (open_clauses & (free == 0)).any():
+                return False
+
+            unit = open_clauses & (free == 1)
+            if not unit.any():
+                return satisfied, free, values
+
+            forced = matrix.literals[(values == 0) & unit[matrix.clause_of]]
+            positive = forced[forced > 0]
+            negative = -forced[forced < 0]
+            if np.intersect1d(positive, negative).size:
+                return False # Two unit clauses force opposite values
+            assignment[positive] = 1
+            assignment[negative] = -1
+            self.propagations += len(forced)
+
+    def select_variable(self, matrix: SignMatrix, assignment, counts):
+        """MOMS: most frequent unassigned variable among the shortest unresolved clauses, None if all are satisfied."""
+        satisfied, free, values = counts
+        open_clauses = ~satisfied
+        if not open_clauses.any():
+            return None
+        shortest = open_clauses & (free == free[open_clauses].min())
+        candidates = matrix.variables[shortest[matrix.clause_of] & (values == 0)]
+        return int(np.bincount(candidates, minlength=matrix.num_vars + 1).argmax())
+
+if np is not None:
+    register_backend(NumpyBackend) # Only selectable by name when NumPy is installed
+
+def evaluate_assignments(clauses, assignments: list[dict[str, bool]]) -> list[bool | None]:
+    """
+    Evaluates a clause set under many partial assignments {symbol: value} in one batched call:
+    True if every clause is satisfied, False if some clause is falsified, None if undetermined.
+    """
+    int_clauses, table = compile_clauses(clauses)
+    matrix = SignMatrix(int_clauses, len(table))
+
+    rows = np.zeros((len(assignments), len(table) + 1), dtype=np.int8)
+    for row, assignment in zip(rows, assignments):
+        for name, value in assignment.items():
+            if name in table:
+                row[table.variable(name)] = 1 if value else -1
+
+    return [None if status == 0 else bool(status > 0) for status in matrix.evaluate_many(rows)]
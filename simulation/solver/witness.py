@@ -0,0 +1,88 @@
+from collections import deque
+
+from ..components import Literal, Clause
+from .cardinality import AtMost
+
+def satisfied(clause: Clause, model: dict[str, bool]) -> bool:
+    return any(model.get(literal.name, False) != literal.negated for literal in clause)
+
+class WitnessPool:
+    """
+    A few models of one theory, kept valid as the theory changes. A literal that one of them
+    makes false is not entailed, and a non-empty pool proves the theory consistent, both without search.
+    Every model assigns every symbol of the theory (the members of the at-most constraint it does
+    not mention are False, other symbols it does not mention can take either value).
+    + tell: a model the new clause leaves false gets one symbol flipped if that breaks no other
+      clause, otherwise it is dropped
+    + retract: a model of a theory is still a model of any subset of it
+    + at-most: the models over a lower bound are dropped
+    """
+
+    def __init__(self, size: int = 8):
+        self.models: deque[dict[str, bool]] = deque(maxlen=size) # Most recent last
+
+    def __len__(self):
+        return len(self.models)
+
+    def clear(self):
+        self.models.clear()
+
+    def add(self, model: dict[str, bool], clauses, at_most: AtMost = None) -> bool:
+        """
+        Adds a model of the clauses, which may be partial (e.g. found on a slice): the latest
+        model of the pool fills in the symbols it leaves out, False the rest.
+        Returns False, and adds nothing, if the result is not a model after all.
+        """
+        candidate = dict(self.models[-1]) if self.models else {}
+        candidate.update(model)
+        for clause in clauses:
+            for literal in clause:
+                candidate.setdefault(literal.name, False)
+            if not satisfied(clause, candidate):
+                return False
+        if at_most is not None and not at_most.holds(candidate):
+            return False
+        self.models.append(candidate)
+        return True
+
+    def refutes(self, literal: Literal, at_most: AtMost = None) -> bool:
+        """True if some model makes the literal false."""
+        for model in self.models:
+            value = model.get(literal.name)
+            if value is None:
+                # A symbol of no clause: False always fits, True unless the at-most constraint counts it
+                if not literal.negated or at_most is None or not at_most.covers(literal.name):
+                    return True
+            elif value == literal.negated:
+                return True
+        return False
+
+    def tell(self, clause: Clause, occurrences: dict[str, set[Clause]], at_most: AtMost = None):
+        """Updates the models for a clause just added to the theory (occurrences already include it)."""
+        kept = [model for model in self.models if self.extend(model, clause, occurrences, at_most)]
+        self.models.clear()
+        self.models.extend(kept)
+
+    def extend(self, model: dict[str, bool], clause: Clause, occurrences: dict[str, set[Clause]], at_most: AtMost = None) -> bool:
+        """Makes the model satisfy the clause (in place) by flipping at most one symbol, False if it cannot."""
+        for literal in clause:
+            model.setdefault(literal.name, False) # New symbol
+        if satisfied(clause, model):
+            return True
+
+        for literal in clause:
+            name = literal.name
+            model[name] = not literal.negated
+            if all(satisfied(other, model) for other in occurrences.get(name, ())):
+                if literal.negated or at_most is None or at_most.holds(model):
+                    return True
+            model[name] = literal.negated
+        return False
+
+    def restrict(self, at_most: AtMost):
+        """Drops the models a new at-most constraint rules out."""
+        if at_most is None:
+            return
+        kept = [model for model in self.models if at_most.holds(model)]
+        self.models.clear()
+        self.models.extend(kept)